@@ -1,12 +1,16 @@
 import asyncio
-import copy
 import contextlib
 import json
+import math
 import os
 import random
 import re
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -22,6 +26,8 @@ from astrbot.core.platform.message_type import MessageType
 PLUGIN_NAME = "astrbot_plugin_liars_bar_basic"
 
 COMMAND_PREFIXES = ["/酒馆", "酒馆", "/骗子酒馆", "骗子酒馆"]
+# Longest alternative first so a longer prefix always wins the match.
+_PREFIX_RE = re.compile("|".join(re.escape(p) for p in sorted(COMMAND_PREFIXES, key=len, reverse=True)))
 
 CARD_SUN = "sun"
 CARD_MOON = "moon"
@@ -53,18 +59,39 @@ WIRE_ALIASES = {
     "yellow": WIRE_YELLOW,
     "y": WIRE_YELLOW,
 }
+# Deletion table for wire args like "红线" / "红色".
+_WIRE_STRIP = str.maketrans("", "", "线色")
+_DIGITS_RE = re.compile(r"\d+")
+_AI_SEQ_RE = re.compile(r"AI-(\d+)")
 
 DEFAULT_PLAY_TIMEOUT_SECONDS = 120
 DEFAULT_WIRE_TIMEOUT_SECONDS = 120
 FIXED_HAND_SIZE = 5
 DEFAULT_AI_LLM_TIMEOUT_SECONDS = 12
 DEFAULT_AI_LLM_RETRY_TIMES = 1
+DEFAULT_AI_LLM_CONCURRENCY = 2
 DEFAULT_AI_MAX_PLAY_CARDS = 3
 DEFAULT_AI_TAUNT_PROBABILITY = 1.0
+AI_DECISION_CACHE_SIZE = 512
+
+TIMER_TICK_SECONDS = 0.1
+TIMER_WHEEL_SLOTS = 1024
+TIMER_PLAY = "play"
+TIMER_WIRE = "wire"
+ROOM_TTL_TICK_SECONDS = 60.0
+ROOM_TTL_WHEEL_SLOTS = 256
+SAVE_DEBOUNCE_SECONDS = 0.25
+RECENT_EVENT_TTL_SECONDS = 30
+RECENT_EVENT_CACHE_MAX = 4096
 
 PHASE_WAITING = "waiting"
 PHASE_PLAYING = "playing"
 PHASE_AWAIT_WIRE = "await_wire"
+_PHASE_LABELS = {
+    PHASE_WAITING: "等待开局",
+    PHASE_PLAYING: "出牌/质疑",
+    PHASE_AWAIT_WIRE: "剪线结算",
+}
 
 AI_TAUNTS = {
     "turn_start": [
@@ -100,6 +127,108 @@ AI_TAUNTS_MINIMAL = {
     "wire": ["我来剪。"],
 }
 
+# Rules forward sections; only the ones with placeholders are formatted per send.
+RULES_SECTIONS = (
+    "【酒馆基础规则】\n1) 每小局随机目标牌（太阳/月亮/星星），并给当前存活玩家每人固定发 5 张",
+    "2) 出牌在私聊完成，群里只公布宣称数量",
+    "3) 质疑规则：下一位可在群里 /酒馆 质疑\n4) 判定规则：暗牌中“任一假即判假”，魔术牌可当目标牌",
+    "5) 受罚进入剪线：三选一 -> 二选一 -> 一选一必爆\n6) 命令：/酒馆 剪线 红|蓝|黄（支持数字）",
+    "7) 超时：出牌{play_timeout}秒超时直接整局淘汰；剪线{wire_timeout}秒超时自动剪线",
+    "8) 若玩家出完手牌，下家会被系统自动触发质疑",
+    "9) 全程一人一房，避免私聊串局",
+    "10) 等待阶段房主可 /酒馆 加AI 或 /酒馆 减AI，AI 会自动行动",
+    "11) 所有命令可随时用 /酒馆 帮助 查询",
+    "12) 本大局牌池在开局时一次锁定，后续小局不变化。\n{pool_text}",
+)
+
+
+def _normalize_taunt_pools(pools: dict[str, list[str]]) -> dict[str, tuple[str, ...]]:
+    # Strip and cap (20 chars) once at import instead of on every AI action.
+    return {action: tuple(line.strip()[:20] for line in lines if line.strip()) for action, lines in pools.items()}
+
+
+AI_TAUNTS = _normalize_taunt_pools(AI_TAUNTS)
+AI_TAUNTS_MINIMAL = _normalize_taunt_pools(AI_TAUNTS_MINIMAL)
+
+
+@lru_cache(maxsize=4096)
+def _render_cards(cards: tuple[str, ...]) -> str:
+    return "、".join(CARD_NAME.get(c, c) for c in cards)
+
+
+@lru_cache(maxsize=4096)
+def _render_hand_list(cards: tuple[str, ...]) -> str:
+    return "  ".join(f"{idx}:{CARD_NAME.get(code, code)}" for idx, code in enumerate(cards, start=1))
+
+
+@lru_cache(maxsize=1024)
+def _challenge_score(truth_count: int, fake_count: int, claim_count: int, alive_n: int) -> float:
+    """Pure scoring core of the AI challenge heuristic (before jitter and clamping)."""
+    prob = 0.12
+    prob += min(0.20, max(0, claim_count - 1) * 0.09)
+    if truth_count == 0:
+        prob += 0.10
+    elif truth_count >= 3 and claim_count <= 1:
+        prob -= 0.05
+    if fake_count == 0 and claim_count >= 2:
+        prob += 0.04
+    if alive_n <= 3:
+        prob += 0.06
+    return prob
+
+
+@lru_cache(maxsize=4)
+def _truth_cards(target_card: str) -> frozenset[str]:
+    """Cards that count as truthful for a target; magic always does."""
+    return frozenset((target_card, CARD_MAGIC))
+
+
+def _split_truth_indices(hand: list[str], target_card: str) -> tuple[list[int], list[int]]:
+    """1-based hand indices partitioned into (truth, fake) in one pass; magic counts as truth."""
+    truth_set = _truth_cards(target_card)
+    truth: list[int] = []
+    fake: list[int] = []
+    for idx, card in enumerate(hand, start=1):
+        (truth if card in truth_set else fake).append(idx)
+    return truth, fake
+
+
+def _scan_json_dict(text: str) -> Optional[dict[str, Any]]:
+    """Single forward pass: try each balanced top-level {...} (string/escape aware) until one parses as a dict."""
+    start = text.find("{")
+    while start >= 0:
+        depth = 0
+        in_str = False
+        escaped = False
+        end = -1
+        for idx in range(start, len(text)):
+            ch = text[idx]
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == '"':
+                in_str = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    end = idx
+                    break
+        if end < 0:
+            return None
+        with contextlib.suppress(Exception):
+            data = json.loads(text[start : end + 1])
+            if isinstance(data, dict):
+                return data
+        start = text.find("{", end + 1)
+    return None
+
+
 try:
     from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
@@ -107,8 +236,15 @@ try:
 except Exception:
     PIL_AVAILABLE = False
 
+try:
+    import orjson
 
-@dataclass
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+
+@dataclass(slots=True)
 class PlayerState:
     user_id: str
     name: str
@@ -119,6 +255,8 @@ class PlayerState:
     bomb_color: str = ""
     wires_remaining: list[str] = field(default_factory=lambda: WIRE_COLORS.copy())
     dm_reachable: bool = False
+    # Derived from room platform + user id; rebuilt on join/load, never persisted.
+    private_umo: str = field(default="", repr=False, compare=False)
 
     def reset_for_new_game(self) -> None:
         self.alive = True
@@ -155,7 +293,7 @@ class PlayerState:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LastPlay:
     player_id: str
     cards: list[str]
@@ -180,7 +318,34 @@ class LastPlay:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class HandView:
+    room_id: str
+    group_id: str
+    platform_id: str
+    phase: str
+    round_no: int
+    target_card: str
+    user_id: str
+    player_name: str
+    is_ai: bool
+    alive: bool
+    hand: list[str]
+    private_umo: str = ""
+
+
+@dataclass(slots=True)
+class RoomSnapshot:
+    # Only what post-lock dispatch reads: the group target, rules-forward sender and pushed hands.
+    room_id: str
+    group_umo: str
+    bot_id: str
+    owner_id: str
+    hands: dict[str, HandView]
+    pool_text: str = ""
+
+
+@dataclass(slots=True)
 class RoomState:
     room_id: str
     group_umo: str
@@ -201,8 +366,7 @@ class RoomState:
     current_turn_user_id: str = ""
     last_play: Optional[LastPlay] = None
     pending_wire_user_id: str = ""
-    wire_options: list[str] = field(default_factory=list)
-    wire_index_map: dict[str, str] = field(default_factory=dict)
+    wire_options: tuple[str, ...] = ()
     initial_player_count: int = 0
     fixed_hand_size: int = FIXED_HAND_SIZE
     round_deck_total: int = 0
@@ -211,9 +375,131 @@ class RoomState:
     wire_deadline_ts: float = 0.0
     action_token: int = 0
     ai_seq: int = 0
+    order_set: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    # Players aligned with order (ids missing from players skipped), so hot loops avoid a players.get per uid.
+    order_players: list[PlayerState] = field(default_factory=list, init=False, repr=False, compare=False)
+    wire_options_set: frozenset[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    wire_opts_comma: str = field(default="", init=False, repr=False, compare=False)
+    wire_opts_slash: str = field(default="", init=False, repr=False, compare=False)
+    _alive_cache: Optional[list[str]] = field(default=None, init=False, repr=False, compare=False)
+    _alive_index: Optional[dict[str, int]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.order_set = set(self.order)
+        self._sync_order_players()
+        self._refresh_wire_opts()
+
+    def set_wire_options(self, options: tuple[str, ...]) -> None:
+        self.wire_options = options
+        self._refresh_wire_opts()
+
+    def _refresh_wire_opts(self) -> None:
+        self.wire_options_set = frozenset(self.wire_options)
+        pairs = [f"{idx}={color}" for idx, color in enumerate(self.wire_options, start=1)]
+        self.wire_opts_comma = ", ".join(pairs)
+        self.wire_opts_slash = " / ".join(pairs)
+
+    def add_player(self, player: PlayerState) -> None:
+        self.players[player.user_id] = player
+        self.order.append(player.user_id)
+        self.order_set.add(player.user_id)
+        self.order_players.append(player)
+        self.invalidate_alive()
+
+    def remove_players(self, user_ids: list[str]) -> list[PlayerState]:
+        drop = set(user_ids)
+        removed = [player for uid in user_ids if (player := self.players.pop(uid, None))]
+        self.order = [uid for uid in self.order if uid not in drop]
+        self.order_set -= drop
+        self._sync_order_players()
+        self.invalidate_alive()
+        return removed
+
+    def set_order(self, order: list[str]) -> None:
+        self.order = order
+        self.order_set = set(order)
+        self._sync_order_players()
+        self.invalidate_alive()
+
+    def _sync_order_players(self) -> None:
+        self.order_players = [p for uid in self.order if (p := self.players.get(uid))]
+
+    def invalidate_alive(self) -> None:
+        # Call after any alive flag flips or membership/order changes.
+        self._alive_cache = None
+        self._alive_index = None
+
+    def eliminate(self, user_id: str) -> None:
+        if player := self.players.get(user_id):
+            player.alive = False
+            player.hand = []
+        self.invalidate_alive()
+
+    def alive_position(self, user_id: str) -> int:
+        if self._alive_index is None:
+            self._alive_index = {uid: idx for idx, uid in enumerate(self.alive_ids())}
+        return self._alive_index.get(user_id, -1)
+
+    def hand_view(self, user_id: str) -> Optional[HandView]:
+        player = self.players.get(user_id)
+        if not player:
+            return None
+        return HandView(
+            room_id=self.room_id,
+            group_id=self.group_id,
+            platform_id=self.platform_id,
+            phase=self.phase,
+            round_no=self.round_no,
+            target_card=self.target_card,
+            user_id=user_id,
+            player_name=player.name,
+            is_ai=player.is_ai,
+            alive=player.alive,
+            hand=list(player.hand),
+            private_umo=player.private_umo,
+        )
+
+    def snapshot(self) -> "RoomState":
+        # Detached copy for lock-free reads (AI decisions): copies the mutable containers, shares immutable scalars.
+        players = {
+            uid: replace(p, hand=list(p.hand), wires_remaining=list(p.wires_remaining))
+            for uid, p in self.players.items()
+        }
+        last_play = replace(self.last_play, cards=list(self.last_play.cards)) if self.last_play else None
+        return replace(
+            self,
+            players=players,
+            order=list(self.order),
+            last_play=last_play,
+            round_deck_counts=dict(self.round_deck_counts),
+        )
+
+    def snapshot_for_dispatch(self, hand_push_uids: set[str]) -> RoomSnapshot:
+        hands = {
+            uid: view
+            for uid in self.order
+            if uid in hand_push_uids and (view := self.hand_view(uid)) and not view.is_ai
+        }
+        return RoomSnapshot(
+            room_id=self.room_id,
+            group_umo=self.group_umo,
+            bot_id=self.bot_id,
+            owner_id=self.owner_id,
+            hands=hands,
+        )
+
+    def acting_user_id(self) -> str:
+        if self.phase == PHASE_PLAYING:
+            return self.current_turn_user_id
+        if self.phase == PHASE_AWAIT_WIRE:
+            return self.pending_wire_user_id
+        return ""
 
     def alive_ids(self) -> list[str]:
-        return [uid for uid in self.order if uid in self.players and self.players[uid].alive]
+        # Shared cached list; callers must not mutate it.
+        if self._alive_cache is None:
+            self._alive_cache = [p.user_id for p in self.order_players if p.alive]
+        return self._alive_cache
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -236,8 +522,7 @@ class RoomState:
             "current_turn_user_id": self.current_turn_user_id,
             "last_play": self.last_play.to_dict() if self.last_play else None,
             "pending_wire_user_id": self.pending_wire_user_id,
-            "wire_options": self.wire_options,
-            "wire_index_map": self.wire_index_map,
+            "wire_options": list(self.wire_options),
             "initial_player_count": self.initial_player_count,
             "fixed_hand_size": self.fixed_hand_size,
             "round_deck_total": self.round_deck_total,
@@ -264,12 +549,16 @@ class RoomState:
             started_at=float(data.get("started_at", 0.0)),
             round_no=int(data.get("round_no", 0)),
             dealer_cursor=int(data.get("dealer_cursor", 0)),
+            players={
+                str(uid): PlayerState.from_dict(raw)
+                for uid, raw in (data.get("players", {}) or {}).items()
+                if isinstance(raw, dict)
+            },
             order=list(data.get("order", []) or []),
             target_card=str(data.get("target_card", "")),
             current_turn_user_id=str(data.get("current_turn_user_id", "")),
             pending_wire_user_id=str(data.get("pending_wire_user_id", "")),
-            wire_options=list(data.get("wire_options", []) or []),
-            wire_index_map=dict(data.get("wire_index_map", {}) or {}),
+            wire_options=tuple(data.get("wire_options", []) or []),
             initial_player_count=int(data.get("initial_player_count", 0)),
             fixed_hand_size=int(data.get("fixed_hand_size", FIXED_HAND_SIZE)),
             round_deck_total=int(data.get("round_deck_total", 0)),
@@ -279,19 +568,13 @@ class RoomState:
             action_token=int(data.get("action_token", 0)),
             ai_seq=int(data.get("ai_seq", 0)),
         )
-        players_raw = data.get("players", {}) or {}
-        room.players = {
-            str(uid): PlayerState.from_dict(raw)
-            for uid, raw in players_raw.items()
-            if isinstance(raw, dict)
-        }
         last_play_raw = data.get("last_play")
         if isinstance(last_play_raw, dict):
             room.last_play = LastPlay.from_dict(last_play_raw)
         return room
 
 
-@dataclass
+@dataclass(slots=True)
 class RoundUpdate:
     outbox: list[tuple[str, list[Any]]] = field(default_factory=list)
     hand_push: list[str] = field(default_factory=list)
@@ -300,6 +583,8 @@ class RoundUpdate:
 class StateRepository:
     def __init__(self, state_path: Path):
         self.state_path = state_path
+        self._write_lock = threading.Lock()
+        self._written_seq = 0
 
     def load(self) -> Optional[dict[str, Any]]:
         if not self.state_path.exists():
@@ -310,11 +595,69 @@ class StateRepository:
         except Exception:
             return None
 
-    def save(self, payload: dict[str, Any]) -> None:
-        tmp = self.state_path.with_suffix(".tmp")
-        with tmp.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-        os.replace(tmp, self.state_path)
+    @staticmethod
+    def serialize(payload: dict[str, Any]) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def save_bytes(self, data: bytes, seq: int) -> None:
+        # Writes may come from the saver thread and from terminate(); never interleave them on the tmp file.
+        # A cancelled saver task cannot stop its thread, so a blob older than the last one written is dropped.
+        with self._write_lock:
+            if seq <= self._written_seq:
+                return
+            self._written_seq = seq
+            tmp = self.state_path.with_suffix(".tmp")
+            with tmp.open("wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.state_path)
+
+
+class TimingWheel:
+    """Hashed timing wheel: O(1) schedule/cancel, drained by a single ticking loop."""
+
+    def __init__(self, slot_count: int, tick_seconds: float):
+        if slot_count <= 0 or slot_count & (slot_count - 1):
+            raise ValueError("slot_count must be a power of two")
+        self.slot_count = slot_count
+        self.mask = slot_count - 1
+        self.tick_seconds = tick_seconds
+        self.slots: list[dict[Any, tuple[int, float, Any]]] = [{} for _ in range(slot_count)]
+        self.slot_of: dict[Any, int] = {}
+        self.cursor = 0
+        self.last_tick_ts = time.time()
+
+    def schedule(self, key: Any, deadline_ts: float, payload: Any) -> None:
+        self.cancel(key)
+        ticks = max(1, math.ceil((deadline_ts - self.last_tick_ts) / self.tick_seconds))
+        slot = (self.cursor + ticks) & self.mask
+        self.slots[slot][key] = ((ticks - 1) // self.slot_count, deadline_ts, payload)
+        self.slot_of[key] = slot
+
+    def cancel(self, key: Any) -> None:
+        slot = self.slot_of.pop(key, None)
+        if slot is not None:
+            self.slots[slot].pop(key, None)
+
+    def advance(self, now: float) -> list[tuple[Any, float, Any]]:
+        due: list[tuple[Any, float, Any]] = []
+        while now - self.last_tick_ts >= self.tick_seconds:
+            self.last_tick_ts += self.tick_seconds
+            self.cursor = (self.cursor + 1) & self.mask
+            bucket = self.slots[self.cursor]
+            if not bucket:
+                continue
+            for key, (rounds, deadline_ts, payload) in list(bucket.items()):
+                if rounds > 0:
+                    bucket[key] = (rounds - 1, deadline_ts, payload)
+                    continue
+                del bucket[key]
+                self.slot_of.pop(key, None)
+                due.append((key, deadline_ts, payload))
+        return due
 
 
 class AssetRenderer:
@@ -325,6 +668,8 @@ class AssetRenderer:
         self.bombs_dir = assets_dir / "bombs"
         self.fonts_dir = assets_dir / "fonts"
         self.cache_dir = cache_dir
+        self._target_paths: dict[str, Path] = {}
+        self._explode_path = self.bombs_dir / "bomb_explode.png"
 
     def ensure_assets(self) -> None:
         self.cards_dir.mkdir(parents=True, exist_ok=True)
@@ -341,12 +686,16 @@ class AssetRenderer:
         return self.cards_dir / f"{card}.png"
 
     def target_path(self, target: str) -> Path:
+        if cached := self._target_paths.get(target):
+            return cached
         target_file = self.cards_dir / f"target_{target}.png"
         if target_file.exists():
+            # Only remember hits: a missing file may still be generated by ensure_assets().
+            self._target_paths[target] = target_file
             return target_file
         return self.card_path(target)
 
-    def bomb_path_for_options(self, options: list[str]) -> Optional[Path]:
+    def bomb_path_for_options(self, options: Sequence[str]) -> Optional[Path]:
         ordered = [c for c in WIRE_COLORS if c in options]
         if len(ordered) == 3:
             return self.bombs_dir / "bomb_3_rby.png"
@@ -359,7 +708,7 @@ class AssetRenderer:
         return None
 
     def bomb_explode_path(self) -> Path:
-        return self.bombs_dir / "bomb_explode.png"
+        return self._explode_path
 
     def build_hand_image(
         self,
@@ -661,14 +1010,38 @@ class LiarsBarBasicPlugin(Star):
         self.state_lock = asyncio.Lock()
         self.rooms: dict[str, RoomState] = {}
         self.player_room_index: dict[str, str] = {}
-        self.recent_event_cache: dict[str, float] = {}
-
-        self.play_timeout_tasks: dict[str, asyncio.Task] = {}
-        self.wire_timeout_tasks: dict[str, asyncio.Task] = {}
+        # Reverse of player_room_index (room_id -> user ids); derived, never persisted.
+        self.room_player_index: dict[str, set[str]] = {}
+        self.recent_event_cache: OrderedDict[str, float] = OrderedDict()
+
+        self.timer_wheel = TimingWheel(TIMER_WHEEL_SLOTS, TIMER_TICK_SECONDS)
+        # Coarse tier for idle-room expiry: 60s tick x 256 slots covers ~4h before rounds kick in.
+        self.ttl_wheel = TimingWheel(ROOM_TTL_WHEEL_SLOTS, ROOM_TTL_TICK_SECONDS)
+        self.timer_handle: Optional[asyncio.TimerHandle] = None
+        self.timer_handler_tasks: set[asyncio.Task] = set()
+        # (sequence, serialized state); the sequence lets StateRepository drop out-of-order writes.
+        self.save_queue: asyncio.Queue[tuple[int, bytes]] = asyncio.Queue()
+        self._save_seq = 0
+        self.saver_task: Optional[asyncio.Task] = None
+        self._save_dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
         self.ai_action_tasks: dict[str, asyncio.Task] = {}
         self.ai_action_task_tokens: dict[str, int] = {}
         self._warn_cooldowns: dict[str, float] = {}
-        self.cleanup_task: Optional[asyncio.Task] = None
+        self._image_comps: dict[str, Any] = {}
+        # (provider, target, sorted hand, claim, alive_n) -> ("challenge"|"play", truth_n, fake_n)
+        self._ai_decision_cache: OrderedDict[tuple, tuple[str, int, int]] = OrderedDict()
+        # Speculative next-AI decisions still waiting on the provider, by decision-cache key.
+        self._ai_inflight: dict[tuple, asyncio.Task] = {}
+        # room_id -> speculative tasks started for that room, cancelled when the room is dropped.
+        self._ai_prefetch_tasks: dict[str, set[asyncio.Task]] = {}
+        # room_id -> (state key, head lines, roster line) for _build_ai_prompt.
+        self._ai_prompt_preambles: dict[str, tuple[tuple, str, str]] = {}
+        # Private RNG for AI play/wire/taunt choices, kept apart from the module-level generator.
+        self._rng = random.Random()
+
+        self._refresh_conf_cache()
+        self._ai_llm_semaphore = asyncio.Semaphore(self._ai_llm_concurrency())
 
         self._load_state()
 
@@ -676,53 +1049,85 @@ class LiarsBarBasicPlugin(Star):
         self.renderer.ensure_assets()
         await self._resume_timers()
         await self._resume_ai_actions()
-        self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+        self._arm_timer_tick()
+        self.saver_task = asyncio.create_task(self._saver_loop())
 
     async def terminate(self):
-        if self.cleanup_task:
-            self.cleanup_task.cancel()
-        for task in list(self.play_timeout_tasks.values()):
-            task.cancel()
-        for task in list(self.wire_timeout_tasks.values()):
+        if self.timer_handle:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+        for task in list(self.timer_handler_tasks):
             task.cancel()
         for task in list(self.ai_action_tasks.values()):
             task.cancel()
-        self.play_timeout_tasks.clear()
-        self.wire_timeout_tasks.clear()
+        for task in list(self._ai_inflight.values()):
+            task.cancel()
+        self.timer_handler_tasks.clear()
         self.ai_action_tasks.clear()
+        self._ai_inflight.clear()
+        self._ai_prefetch_tasks.clear()
         self.ai_action_task_tokens.clear()
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_dirty:
+            self._save_dirty = False
+            self._enqueue_state_snapshot()
+        if self.saver_task:
+            self.saver_task.cancel()
+        self._flush_pending_save()
+
+    def _refresh_conf_cache(self) -> None:
+        # Hot-path config values are read once here; AstrBot re-instantiates the plugin when config is saved.
+        self._play_to_cached = max(1, int(self.conf.get("play_timeout_seconds", DEFAULT_PLAY_TIMEOUT_SECONDS)))
+        self._wire_to_cached = max(1, int(self.conf.get("wire_timeout_seconds", DEFAULT_WIRE_TIMEOUT_SECONDS)))
+        self._ai_enabled_cached = bool(self.conf.get("ai_enabled", True))
+        self._cfg_ai_provider_id = str(self.conf.get("ai_provider_id", "")).strip()
+        self._cfg_ai_llm_timeout = max(1, int(self.conf.get("ai_llm_timeout_seconds", DEFAULT_AI_LLM_TIMEOUT_SECONDS)))
+        self._cfg_ai_llm_retry = max(0, int(self.conf.get("ai_llm_retry_times", DEFAULT_AI_LLM_RETRY_TIMES)))
+        self._cfg_ai_llm_concurrency = max(1, int(self.conf.get("ai_llm_concurrency", DEFAULT_AI_LLM_CONCURRENCY)))
+        self._cfg_ai_taunt_enabled = bool(self.conf.get("ai_taunt_enabled", True))
+        try:
+            prob = float(self.conf.get("ai_taunt_probability", DEFAULT_AI_TAUNT_PROBABILITY))
+        except Exception:
+            prob = DEFAULT_AI_TAUNT_PROBABILITY
+        self._cfg_ai_taunt_probability = max(0.0, min(1.0, prob))
+        self._cfg_ai_max_play = max(1, int(self.conf.get("ai_max_play_cards", DEFAULT_AI_MAX_PLAY_CARDS)))
+        # Rendered lazily by _help_text; only the timeouts above vary it.
+        self._help_text_cache: Optional[str] = None
 
     def _play_timeout_seconds(self) -> int:
-        return max(1, int(self.conf.get("play_timeout_seconds", DEFAULT_PLAY_TIMEOUT_SECONDS)))
+        return self._play_to_cached
 
     def _wire_timeout_seconds(self) -> int:
-        return max(1, int(self.conf.get("wire_timeout_seconds", DEFAULT_WIRE_TIMEOUT_SECONDS)))
+        return self._wire_to_cached
+
+    def _room_ttl_seconds(self) -> int:
+        return max(60, int(self.conf.get("room_ttl_minutes", 180)) * 60)
 
     def _ai_enabled(self) -> bool:
-        return bool(self.conf.get("ai_enabled", True))
+        return self._ai_enabled_cached
 
     def _ai_provider_id(self) -> str:
-        return str(self.conf.get("ai_provider_id", "")).strip()
+        return self._cfg_ai_provider_id
 
     def _ai_llm_timeout_seconds(self) -> int:
-        return max(1, int(self.conf.get("ai_llm_timeout_seconds", DEFAULT_AI_LLM_TIMEOUT_SECONDS)))
+        return self._cfg_ai_llm_timeout
 
     def _ai_llm_retry_times(self) -> int:
-        return max(0, int(self.conf.get("ai_llm_retry_times", DEFAULT_AI_LLM_RETRY_TIMES)))
+        return self._cfg_ai_llm_retry
+
+    def _ai_llm_concurrency(self) -> int:
+        return self._cfg_ai_llm_concurrency
 
     def _ai_taunt_enabled(self) -> bool:
-        return bool(self.conf.get("ai_taunt_enabled", True))
+        return self._cfg_ai_taunt_enabled
 
     def _ai_taunt_probability(self) -> float:
-        value = self.conf.get("ai_taunt_probability", DEFAULT_AI_TAUNT_PROBABILITY)
-        try:
-            prob = float(value)
-        except Exception:
-            prob = DEFAULT_AI_TAUNT_PROBABILITY
-        return max(0.0, min(1.0, prob))
+        return self._cfg_ai_taunt_probability
 
     def _ai_max_play_cards(self) -> int:
-        return max(1, int(self.conf.get("ai_max_play_cards", DEFAULT_AI_MAX_PLAY_CARDS)))
+        return self._cfg_ai_max_play
 
     def _build_locked_deck_counts(self, start_player_count: int) -> dict[str, int]:
         players = max(3, min(5, int(start_player_count)))
@@ -751,9 +1156,16 @@ class LiarsBarBasicPlugin(Star):
             + [CARD_STAR] * int(counts.get(CARD_STAR, 0))
             + [CARD_MAGIC] * int(counts.get(CARD_MAGIC, 0))
         )
-        random.shuffle(deck)
         return deck
 
+    @staticmethod
+    def _partial_shuffle_prefix(deck: list[str], k: int) -> None:
+        # First k steps of Fisher-Yates: deck[:k] becomes a uniform random draw; the tail is left as-is.
+        n = len(deck)
+        for i in range(min(k, n - 1)):
+            j = random.randrange(i, n)
+            deck[i], deck[j] = deck[j], deck[i]
+
     def _card_pool_text(self, room: RoomState) -> str:
         hand_size = max(1, int(room.fixed_hand_size or FIXED_HAND_SIZE))
         counts = room.round_deck_counts or self._build_locked_deck_counts(room.initial_player_count or len(room.order) or 4)
@@ -893,24 +1305,21 @@ class LiarsBarBasicPlugin(Star):
         await event.send(event.plain_result(text))
 
     async def _cmd_create_room(self, event: AstrMessageEvent) -> None:
-        user_id = str(event.get_sender_id())
-        user_name = event.get_sender_name()
-        room_id = event.unified_msg_origin
+        user_id, user_name, room_id = self._identify(event)
         group_id = str(event.get_group_id() or "")
         platform_id = self._platform_id_from_umo(room_id)
         bot_id = str(getattr(event, "get_self_id", lambda: "")( ))
 
-        msg = ""
+        reply: tuple[str, str] = ("", "")
         async with self.state_lock:
             conflict_room = self.player_room_index.get(user_id)
             if conflict_room and conflict_room != room_id:
-                msg = self._guide(
+                reply = (
                     f"你已在其他房间中（群 {self._room_group_hint(conflict_room)}），不能重复开房。",
                     "先在原房间用 /酒馆 结束，或等待房间结束后再加入新房。",
                 )
-            elif room_id in self.rooms:
-                room = self.rooms[room_id]
-                msg = self._guide(
+            elif (room := self.rooms.get(room_id)) is not None:
+                reply = (
                     f"本群已经存在酒馆房间，当前人数 {len(room.order)}。",
                     "其他玩家请用 /酒馆 加入，房主人数够后用 /酒馆 开始。",
                 )
@@ -927,58 +1336,61 @@ class LiarsBarBasicPlugin(Star):
                     created_at=now,
                     updated_at=now,
                 )
-                room.players[user_id] = PlayerState(user_id=user_id, name=user_name)
-                room.order.append(user_id)
+                room.add_player(
+                    PlayerState(user_id=user_id, name=user_name, private_umo=self._private_umo(platform_id, user_id))
+                )
 
                 self.rooms[room_id] = room
-                self.player_room_index[user_id] = room_id
-                await self._save_state_locked()
-                msg = self._guide(
+                self._index_player_locked(user_id, room_id)
+                self._touch_room_locked(room)
+                self._save_state_locked()
+                reply = (
                     f"开房成功。你是房主，当前 1/5 人。\n{self._room_create_card_intro()}",
                     "让其他人发送 /酒馆 加入；也可先 /酒馆 加AI。人数达到 3~5 后你发送 /酒馆 开始。",
                 )
 
-        await event.send(event.plain_result(msg))
+        await event.send(event.plain_result(self._guide(*reply)))
 
     async def _cmd_join_room(self, event: AstrMessageEvent) -> None:
-        user_id = str(event.get_sender_id())
-        user_name = event.get_sender_name()
-        room_id = event.unified_msg_origin
+        user_id, user_name, room_id = self._identify(event)
 
-        msg = ""
+        reply: tuple[str, str] = ("", "")
         async with self.state_lock:
             room = self.rooms.get(room_id)
+            conflict_room = self.player_room_index.get(user_id)
             if not room:
-                msg = self._guide("本群当前没有房间。", "先由一名玩家发送 /酒馆 开房。")
-            elif (conflict_room := self.player_room_index.get(user_id)) and conflict_room != room_id:
-                msg = self._guide(
+                reply = ("本群当前没有房间。", "先由一名玩家发送 /酒馆 开房。")
+            elif conflict_room and conflict_room != room_id:
+                reply = (
                     f"你已在其他房间中（群 {self._room_group_hint(conflict_room)}）。",
                     "请先结束原房间后再加入。",
                 )
             elif room.phase != PHASE_WAITING:
-                msg = self._guide("当前房间已开始，不能中途加入。", "等待本局结束后再开新房。")
-            elif user_id in room.players:
-                msg = self._guide("你已经在房间中了。", "房主可在人数达标后发送 /酒馆 开始。")
+                reply = ("当前房间已开始，不能中途加入。", "等待本局结束后再开新房。")
+            elif user_id in room.order_set:
+                reply = ("你已经在房间中了。", "房主可在人数达标后发送 /酒馆 开始。")
             elif len(room.order) >= 5:
-                msg = self._guide("房间人数已满（5人）。", "可等待下一局或由房主 /酒馆 结束 后重开。")
+                reply = ("房间人数已满（5人）。", "可等待下一局或由房主 /酒馆 结束 后重开。")
             else:
-                room.players[user_id] = PlayerState(user_id=user_id, name=user_name)
-                room.order.append(user_id)
-                room.updated_at = time.time()
-                self.player_room_index[user_id] = room_id
-                await self._save_state_locked()
+                room.add_player(
+                    PlayerState(user_id=user_id, name=user_name, private_umo=self._private_umo(room.platform_id, user_id))
+                )
+                self._touch_room_locked(room)
+                if conflict_room != room_id:
+                    self._index_player_locked(user_id, room_id)
+                self._save_state_locked()
 
                 count = len(room.order)
-                owner_name = room.players.get(room.owner_id).name if room.owner_id in room.players else room.owner_name
-                msg = self._guide(
+                owner = room.players.get(room.owner_id)
+                owner_name = owner.name if owner else room.owner_name
+                reply = (
                     f"加入成功，当前 {count}/5 人。房主：{owner_name}",
                     "人数达到 3~5 后，房主可 /酒馆 开始（也可先 /酒馆 加AI 调整人数）。",
                 )
-        await event.send(event.plain_result(msg))
+        await event.send(event.plain_result(self._guide(*reply)))
 
     async def _cmd_add_ai(self, event: AstrMessageEvent, args: list[str]) -> None:
-        room_id = event.unified_msg_origin
-        user_id = str(event.get_sender_id())
+        user_id, _, room_id = self._identify(event)
 
         if not self._ai_enabled():
             msg = self._guide("当前已关闭 AI 玩家功能。", "如需启用，请在插件配置中打开 ai_enabled。")
@@ -991,27 +1403,28 @@ class LiarsBarBasicPlugin(Star):
             await event.send(event.plain_result(msg))
             return
 
-        msg = ""
+        reply: tuple[str, str] = ("", "")
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room:
-                msg = self._guide("本群当前没有房间。", "先由一名玩家发送 /酒馆 开房。")
+                reply = ("本群当前没有房间。", "先由一名玩家发送 /酒馆 开房。")
             elif room.phase != PHASE_WAITING:
-                msg = self._guide("只允许在等待阶段调整 AI。", "请等待本局结束后再调整。")
+                reply = ("只允许在等待阶段调整 AI。", "请等待本局结束后再调整。")
             elif user_id != room.owner_id:
-                msg = self._guide("只有房主可以调整 AI 人数。", "请房主发送 /酒馆 加AI。")
+                reply = ("只有房主可以调整 AI 人数。", "请房主发送 /酒馆 加AI。")
             else:
-                human_count = sum(1 for uid in room.order if uid in room.players and not room.players[uid].is_ai)
+                human_count = sum(1 for p in room.order_players if not p.is_ai)
                 if human_count <= 0:
-                    msg = self._guide("房间内至少需要 1 名人类玩家。", "请先让真人玩家加入。")
+                    reply = ("房间内至少需要 1 名人类玩家。", "请先让真人玩家加入。")
                 else:
                     available = max(0, 5 - len(room.order))
                     if available <= 0:
-                        msg = self._guide("房间人数已满（5人）。", "可先用 /酒馆 减AI 或直接 /酒馆 开始。")
+                        reply = ("房间人数已满（5人）。", "可先用 /酒馆 减AI 或直接 /酒馆 开始。")
                     else:
                         add_n = min(count, available)
                         added_names: list[str] = []
-                        for _ in range(add_n):
+                        bomb_colors = random.choices(WIRE_COLORS, k=add_n)
+                        for bomb_color in bomb_colors:
                             ai_uid, ai_name = self._alloc_ai_identity_locked(room)
                             ai_player = PlayerState(
                                 user_id=ai_uid,
@@ -1020,29 +1433,27 @@ class LiarsBarBasicPlugin(Star):
                                 ai_label=ai_name,
                                 dm_reachable=True,
                             )
-                            ai_player.bomb_color = random.choice(WIRE_COLORS)
-                            room.players[ai_uid] = ai_player
-                            room.order.append(ai_uid)
+                            ai_player.bomb_color = bomb_color
+                            room.add_player(ai_player)
                             added_names.append(ai_name)
 
-                        room.updated_at = time.time()
-                        await self._save_state_locked()
+                        self._touch_room_locked(room)
+                        self._save_state_locked()
 
                         if add_n < count:
-                            msg = self._guide(
+                            reply = (
                                 f"已添加 {add_n} 名 AI（达到人数上限）。当前人数 {len(room.order)}/5：{', '.join(added_names)}",
                                 "人数满足后，房主可发送 /酒馆 开始。",
                             )
                         else:
-                            msg = self._guide(
+                            reply = (
                                 f"已添加 {add_n} 名 AI。当前人数 {len(room.order)}/5：{', '.join(added_names)}",
                                 "继续等待玩家加入，或由房主发送 /酒馆 开始。",
                             )
-        await event.send(event.plain_result(msg))
+        await event.send(event.plain_result(self._guide(*reply)))
 
     async def _cmd_remove_ai(self, event: AstrMessageEvent, args: list[str]) -> None:
-        room_id = event.unified_msg_origin
-        user_id = str(event.get_sender_id())
+        user_id, _, room_id = self._identify(event)
 
         count = self._parse_count_arg(args, default=1)
         if count is None:
@@ -1050,45 +1461,41 @@ class LiarsBarBasicPlugin(Star):
             await event.send(event.plain_result(msg))
             return
 
-        msg = ""
+        reply: tuple[str, str] = ("", "")
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room:
-                msg = self._guide("本群当前没有房间。", "先由一名玩家发送 /酒馆 开房。")
+                reply = ("本群当前没有房间。", "先由一名玩家发送 /酒馆 开房。")
             elif room.phase != PHASE_WAITING:
-                msg = self._guide("只允许在等待阶段调整 AI。", "请等待本局结束后再调整。")
+                reply = ("只允许在等待阶段调整 AI。", "请等待本局结束后再调整。")
             elif user_id != room.owner_id:
-                msg = self._guide("只有房主可以调整 AI 人数。", "请房主发送 /酒馆 减AI。")
+                reply = ("只有房主可以调整 AI 人数。", "请房主发送 /酒馆 减AI。")
             else:
-                human_count = sum(1 for uid in room.order if uid in room.players and not room.players[uid].is_ai)
+                human_count = sum(1 for p in room.order_players if not p.is_ai)
                 if human_count <= 0:
-                    msg = self._guide("房间内至少需要 1 名人类玩家。", "请先让真人玩家加入。")
+                    reply = ("房间内至少需要 1 名人类玩家。", "请先让真人玩家加入。")
                 else:
-                    ai_ids = [uid for uid in room.order if uid in room.players and room.players[uid].is_ai]
+                    ai_ids = [p.user_id for p in room.order_players if p.is_ai]
                     if not ai_ids:
-                        msg = self._guide("当前房间没有 AI 玩家。", "如需添加请用 /酒馆 加AI。")
+                        reply = ("当前房间没有 AI 玩家。", "如需添加请用 /酒馆 加AI。")
                     else:
                         remove_n = min(count, len(ai_ids))
-                        remove_ids = list(reversed(ai_ids))[:remove_n]
-                        removed_names: list[str] = []
+                        remove_ids = ai_ids[-remove_n:][::-1]
+                        removed_names = [player.name for player in room.remove_players(remove_ids)]
                         for rid in remove_ids:
-                            player = room.players.pop(rid, None)
-                            if player:
-                                removed_names.append(player.name)
-                            room.order = [uid for uid in room.order if uid != rid]
-                            self.player_room_index.pop(rid, None)
-
-                        room.updated_at = time.time()
-                        await self._save_state_locked()
-                        msg = self._guide(
+                            self._unindex_player_locked(rid)
+
+                        self._touch_room_locked(room)
+                        self._save_state_locked()
+                        reply = (
                             f"已移除 {remove_n} 名 AI。当前人数 {len(room.order)}/5：{', '.join(removed_names)}",
                             "可继续 /酒馆 加AI，或由房主发送 /酒馆 开始。",
                         )
-        await event.send(event.plain_result(msg))
+        await event.send(event.plain_result(self._guide(*reply)))
 
     async def _cmd_start_room(self, event: AstrMessageEvent) -> None:
-        room_id = event.unified_msg_origin
-        user_id = str(event.get_sender_id())
+        user_id, _, room_id = self._identify(event)
+        ai_enabled = self._ai_enabled()
         err_msg = ""
         need_check = False
         probe_targets: list[str] = []
@@ -1106,18 +1513,14 @@ class LiarsBarBasicPlugin(Star):
                 err_msg = self._guide("人数不足，至少需要 3 人。", "让更多玩家发送 /酒馆 加入。")
             elif len(room.order) > 5:
                 err_msg = self._guide("人数超过上限 5 人。", "请房主 /酒馆 结束 后重新开房。")
-            elif sum(1 for uid in room.order if uid in room.players and not room.players[uid].is_ai) <= 0:
+            elif sum(1 for p in room.order_players if not p.is_ai) <= 0:
                 err_msg = self._guide("至少需要 1 名人类玩家。", "请先让真人玩家加入后再开始。")
-            elif not self._ai_enabled() and any(uid in room.players and room.players[uid].is_ai for uid in room.order):
+            elif not ai_enabled and any(p.is_ai for p in room.order_players):
                 err_msg = self._guide("当前 AI 功能已关闭，无法带 AI 开局。", "请先 /酒馆 减AI，或在配置里打开 ai_enabled。")
             else:
                 need_check = bool(self.conf.get("require_dm_reachable_before_start", True))
                 if need_check:
-                    probe_targets = [
-                        uid
-                        for uid in room.order
-                        if uid in room.players and not room.players[uid].is_ai
-                    ]
+                    probe_targets = [p.user_id for p in room.order_players if not p.is_ai]
                     probe_platform_id = room.platform_id
 
         if err_msg:
@@ -1138,7 +1541,7 @@ class LiarsBarBasicPlugin(Star):
 
         outbox: list[tuple[str, list[Any]]] = []
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
         send_rules = False
 
         async with self.state_lock:
@@ -1151,20 +1554,20 @@ class LiarsBarBasicPlugin(Star):
                 err_msg = self._guide("只有房主可以开始。", "请房主发送 /酒馆 开始。")
             elif len(room.order) < 3 or len(room.order) > 5:
                 err_msg = self._guide("人数不在 3~5 范围。", "请调整人数后重试 /酒馆 开始。")
-            elif sum(1 for uid in room.order if uid in room.players and not room.players[uid].is_ai) <= 0:
+            elif sum(1 for p in room.order_players if not p.is_ai) <= 0:
                 err_msg = self._guide("至少需要 1 名人类玩家。", "请先让真人玩家加入后再开始。")
-            elif not self._ai_enabled() and any(uid in room.players and room.players[uid].is_ai for uid in room.order):
+            elif not ai_enabled and any(p.is_ai for p in room.order_players):
                 err_msg = self._guide("当前 AI 功能已关闭，无法带 AI 开局。", "请先 /酒馆 减AI，或在配置里打开 ai_enabled。")
             else:
                 failed: list[str] = []
                 if need_check:
-                    for uid in room.order:
-                        player = room.players.get(uid)
-                        if player and player.is_ai:
+                    for player in room.order_players:
+                        if player.is_ai:
                             player.dm_reachable = True
                             continue
+                        uid = player.user_id
                         ok = bool(probe_results.get(uid, False))
-                        room.players[uid].dm_reachable = ok
+                        player.dm_reachable = ok
                         if not ok:
                             failed.append(uid)
 
@@ -1175,8 +1578,8 @@ class LiarsBarBasicPlugin(Star):
                         chain.append(Comp.At(qq=uid))
                     chain.append(Comp.Plain("\n下一步：处理后由房主再次发送 /酒馆 开始。"))
                     outbox.append((room.group_umo, chain))
-                    room.updated_at = time.time()
-                    await self._save_state_locked()
+                    self._touch_room_locked(room)
+                    self._save_state_locked()
                 else:
                     room.phase = PHASE_PLAYING
                     room.started_at = time.time()
@@ -1184,8 +1587,7 @@ class LiarsBarBasicPlugin(Star):
                     room.dealer_cursor = random.randint(0, max(0, len(room.order) - 1))
                     room.last_play = None
                     room.pending_wire_user_id = ""
-                    room.wire_options = []
-                    room.wire_index_map = {}
+                    room.set_wire_options(())
                     room.initial_player_count = len(room.order)
                     room.fixed_hand_size = FIXED_HAND_SIZE
                     room.round_deck_counts = self._build_locked_deck_counts(room.initial_player_count)
@@ -1193,16 +1595,18 @@ class LiarsBarBasicPlugin(Star):
                     room.play_deadline_ts = 0
                     room.wire_deadline_ts = 0
 
-                    for uid in room.order:
-                        room.players[uid].reset_for_new_game()
-                        if room.players[uid].is_ai or not need_check:
-                            room.players[uid].dm_reachable = True
+                    for player in room.order_players:
+                        player.reset_for_new_game()
+                        if player.is_ai or not need_check:
+                            player.dm_reachable = True
+                    room.invalidate_alive()
 
                     update = self._start_new_round_locked(room, reason="大局开始")
-                    room.updated_at = time.time()
-                    await self._save_state_locked()
-                    if room.room_id in self.rooms:
-                        room_snapshot = copy.deepcopy(room)
+                    self._touch_room_locked(room)
+                    self._save_state_locked()
+                    room_snapshot = self._dispatch_snapshot_locked(room, update)
+                    if room_snapshot:
+                        room_snapshot.pool_text = self._card_pool_text(room)
                         send_rules = True
 
         if err_msg:
@@ -1219,16 +1623,17 @@ class LiarsBarBasicPlugin(Star):
 
     async def _cmd_status(self, event: AstrMessageEvent) -> None:
         room_id = event.unified_msg_origin
-        msg = ""
+        reply: tuple[str, str] = ("", "")
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room:
-                msg = self._guide("本群没有进行中的酒馆房间。", "先发送 /酒馆 开房。")
+                reply = ("本群没有进行中的酒馆房间。", "先发送 /酒馆 开房。")
             else:
+                display = self._display_player_name
                 alive = room.alive_ids()
                 lines = [
                     f"房间状态：{self._phase_label(room.phase)}",
-                    f"房主：{self._display_player_name(room, room.owner_id) if room.owner_id in room.players else room.owner_name}",
+                    f"房主：{display(room, room.owner_id) if room.owner_id in room.players else room.owner_name}",
                     f"玩家数：{len(room.order)}（存活 {len(alive)}）",
                     f"小局：第 {room.round_no} 局",
                 ]
@@ -1237,7 +1642,7 @@ class LiarsBarBasicPlugin(Star):
                     lines.append(f"当前目标牌：{CARD_NAME.get(room.target_card, room.target_card)}")
 
                 if room.phase == PHASE_PLAYING and room.current_turn_user_id:
-                    pname = self._display_player_name(room, room.current_turn_user_id)
+                    pname = display(room, room.current_turn_user_id)
                     turn_player = room.players.get(room.current_turn_user_id)
                     if turn_player and turn_player.is_ai:
                         lines.append(f"当前行动：{pname}（系统自动执行中）")
@@ -1245,8 +1650,8 @@ class LiarsBarBasicPlugin(Star):
                         lines.append(f"当前行动：{pname}（私聊 /酒馆 出 序号...）")
 
                 if room.phase == PHASE_AWAIT_WIRE and room.pending_wire_user_id:
-                    pname = self._display_player_name(room, room.pending_wire_user_id)
-                    opts = ", ".join([f"{idx}={color}" for idx, color in room.wire_index_map.items()])
+                    pname = display(room, room.pending_wire_user_id)
+                    opts = room.wire_opts_comma
                     pending = room.players.get(room.pending_wire_user_id)
                     if pending and pending.is_ai:
                         lines.append(f"待剪线：{pname}（系统自动执行，当前可选 {opts}）")
@@ -1254,12 +1659,10 @@ class LiarsBarBasicPlugin(Star):
                         lines.append(f"待剪线：{pname}（{opts}）")
 
                 lines.append("玩家信息：")
-                for uid in room.order:
-                    p = room.players.get(uid)
-                    if not p:
-                        continue
-                    status = "存活" if p.alive else "出局"
-                    lines.append(f"- {self._display_player_name(room, uid)}：{status}，手牌 {len(p.hand)}")
+                lines.extend(
+                    f"- {display(room, p.user_id)}：{'存活' if p.alive else '出局'}，手牌 {len(p.hand)}"
+                    for p in room.order_players
+                )
 
                 if room.phase == PHASE_WAITING:
                     guide = "等待阶段：玩家可 /酒馆 加入，房主可 /酒馆 加AI 或 /酒馆 开始。"
@@ -1267,15 +1670,14 @@ class LiarsBarBasicPlugin(Star):
                     guide = "剪线阶段：等待受罚玩家 /酒馆 剪线，或等待系统自动处理。"
                 else:
                     guide = "可用 /酒馆 质疑、/酒馆 剪线、/酒馆 结束 或 /酒馆 帮助。"
-                msg = self._guide("\n".join(lines), guide)
-        await event.send(event.plain_result(msg))
+                reply = ("\n".join(lines), guide)
+        await event.send(event.plain_result(self._guide(*reply)))
 
     async def _cmd_challenge(self, event: AstrMessageEvent) -> None:
-        room_id = event.unified_msg_origin
-        challenger_id = str(event.get_sender_id())
+        challenger_id, _, room_id = self._identify(event)
         msg = ""
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
 
         async with self.state_lock:
             room = self.rooms.get(room_id)
@@ -1290,10 +1692,9 @@ class LiarsBarBasicPlugin(Star):
                 msg = self._guide(f"现在应由 {current_name} 决定是否质疑。", "请等待轮到你。")
             else:
                 update = self._resolve_challenge_locked(room, challenger_id, auto=False)
-                room.updated_at = time.time()
-                await self._save_state_locked()
-                if room.room_id in self.rooms:
-                    room_snapshot = copy.deepcopy(room)
+                self._touch_room_locked(room)
+                self._save_state_locked()
+                room_snapshot = self._dispatch_snapshot_locked(room, update)
 
         if msg:
             await event.send(event.plain_result(msg))
@@ -1301,8 +1702,7 @@ class LiarsBarBasicPlugin(Star):
         await self._dispatch_round_update(room_snapshot, update)
 
     async def _cmd_cut_wire(self, event: AstrMessageEvent, args: list[str]) -> None:
-        room_id = event.unified_msg_origin
-        user_id = str(event.get_sender_id())
+        user_id, _, room_id = self._identify(event)
 
         if not args:
             msg = self._guide("用法：/酒馆 剪线 红|蓝|黄（也支持 1/2/3）", "先用 /酒馆 状态 查看当前可选线。")
@@ -1311,7 +1711,7 @@ class LiarsBarBasicPlugin(Star):
 
         msg = ""
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room:
@@ -1324,14 +1724,12 @@ class LiarsBarBasicPlugin(Star):
             else:
                 picked = self._resolve_wire_arg(args[0], room)
                 if not picked:
-                    opts = " / ".join([f"{k}={v}" for k, v in room.wire_index_map.items()])
-                    msg = self._guide(f"线名无效。当前可选：{opts}", "请重新发送 /酒馆 剪线 红|蓝|黄。")
+                    msg = self._guide(f"线名无效。当前可选：{room.wire_opts_slash}", "请重新发送 /酒馆 剪线 红|蓝|黄。")
                 else:
                     update = self._apply_wire_cut_locked(room, user_id, picked, by_timeout=False)
-                    room.updated_at = time.time()
-                    await self._save_state_locked()
-                    if room.room_id in self.rooms:
-                        room_snapshot = copy.deepcopy(room)
+                    self._touch_room_locked(room)
+                    self._save_state_locked()
+                    room_snapshot = self._dispatch_snapshot_locked(room, update)
 
         if msg:
             await event.send(event.plain_result(msg))
@@ -1339,8 +1737,7 @@ class LiarsBarBasicPlugin(Star):
         await self._dispatch_round_update(room_snapshot, update)
 
     async def _cmd_end_room(self, event: AstrMessageEvent) -> None:
-        room_id = event.unified_msg_origin
-        user_id = str(event.get_sender_id())
+        user_id, user_name, room_id = self._identify(event)
         is_admin = bool(getattr(event, "is_admin", lambda: False)())
         msg = ""
         outbox: list[tuple[str, list[Any]]] = []
@@ -1352,7 +1749,7 @@ class LiarsBarBasicPlugin(Star):
             elif user_id != room.owner_id and not is_admin:
                 msg = self._guide("仅房主或管理员可以结束房间。", "请让房主发送 /酒馆 结束。")
             else:
-                ender = self._display_player_name(room, user_id) if user_id in room.players else event.get_sender_name()
+                ender = self._display_player_name(room, user_id) if user_id in room.players else user_name
                 outbox.append(
                     (
                         room.group_umo,
@@ -1367,7 +1764,7 @@ class LiarsBarBasicPlugin(Star):
                     )
                 )
                 self._drop_room_locked(room.room_id)
-                await self._save_state_locked()
+                self._save_state_locked()
 
         if msg:
             await event.send(event.plain_result(msg))
@@ -1377,25 +1774,24 @@ class LiarsBarBasicPlugin(Star):
     async def _cmd_private_hand(self, event: AstrMessageEvent) -> None:
         user_id = str(event.get_sender_id())
         msg = ""
-        room_snapshot: Optional[RoomState] = None
+        view: Optional[HandView] = None
         async with self.state_lock:
             room_id = self.player_room_index.get(user_id)
-            if not room_id or room_id not in self.rooms:
+            room = self.rooms.get(room_id) if room_id else None
+            if not room:
                 msg = self._guide("你当前不在任何酒馆房间。", "先去群里发送 /酒馆 开房 或 /酒馆 加入。")
             else:
-                room = self.rooms[room_id]
-                if user_id not in room.players:
+                view = room.hand_view(user_id)
+                if not view:
                     msg = self._guide("房间状态异常，未找到你的玩家信息。", "请通知房主 /酒馆 结束 后重开。")
-                else:
-                    room_snapshot = copy.deepcopy(room)
 
         if msg:
             await event.send(event.plain_result(msg))
             return
 
         try:
-            if room_snapshot:
-                await self._send_private_hand(room_snapshot, user_id, force_tip=True)
+            if view:
+                await self._send_private_hand_view(view, force_tip=True)
         except Exception:
             msg = self._guide("私聊消息发送失败。", "请先加好友并私聊机器人一次后重试。")
             await event.send(event.plain_result(msg))
@@ -1405,14 +1801,14 @@ class LiarsBarBasicPlugin(Star):
         msg = ""
         done_msg = ""
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
 
         async with self.state_lock:
             room_id = self.player_room_index.get(user_id)
-            if not room_id or room_id not in self.rooms:
+            room = self.rooms.get(room_id) if room_id else None
+            if not room:
                 msg = self._guide("你当前不在任何酒馆房间。", "先去群里 /酒馆 开房 或 /酒馆 加入。")
             else:
-                room = self.rooms[room_id]
                 if room.phase != PHASE_PLAYING:
                     msg = self._guide("当前不是出牌阶段。", "可在群里用 /酒馆 状态 查看当前需要动作。")
                 else:
@@ -1434,10 +1830,9 @@ class LiarsBarBasicPlugin(Star):
                             indices = parsed
                             update, done_msg = self._apply_play_locked(room, user_id, indices, taunt_line="")
 
-                            room.updated_at = time.time()
-                            await self._save_state_locked()
-                            if room.room_id in self.rooms:
-                                room_snapshot = copy.deepcopy(room)
+                            self._touch_room_locked(room)
+                            self._save_state_locked()
+                            room_snapshot = self._dispatch_snapshot_locked(room, update)
 
         if msg:
             await event.send(event.plain_result(msg))
@@ -1500,8 +1895,7 @@ class LiarsBarBasicPlugin(Star):
             room.current_turn_user_id = next_uid
             room.phase = PHASE_PLAYING
             room.pending_wire_user_id = ""
-            room.wire_options = []
-            room.wire_index_map = {}
+            room.set_wire_options(())
             room.wire_deadline_ts = 0
             room.action_token += 1
             room.play_deadline_ts = time.time() + self._play_timeout_seconds()
@@ -1521,12 +1915,13 @@ class LiarsBarBasicPlugin(Star):
             return update
 
         last = room.last_play
-        liar = any(card not in {room.target_card, CARD_MAGIC} for card in last.cards)
+        truth = _truth_cards(room.target_card)
+        liar = any(card not in truth for card in last.cards)
         punished_id = last.player_id if liar else challenger_id
 
         revealer = self._display_player_name(room, last.player_id)
         challenger = self._display_player_name(room, challenger_id)
-        revealed_cards = "、".join(CARD_NAME.get(c, c) for c in last.cards)
+        revealed_cards = _render_cards(tuple(last.cards))
 
         if liar:
             result = f"质疑成立：{revealer} 本次暗牌包含非目标牌。"
@@ -1551,8 +1946,7 @@ class LiarsBarBasicPlugin(Star):
 
         room.phase = PHASE_AWAIT_WIRE
         room.pending_wire_user_id = punished_id
-        room.wire_options = [c for c in WIRE_COLORS if c in punished.wires_remaining]
-        room.wire_index_map = {str(i + 1): color for i, color in enumerate(room.wire_options)}
+        room.set_wire_options(tuple(c for c in WIRE_COLORS if c in punished.wires_remaining))
         room.play_deadline_ts = 0
         self._cancel_play_timeout_task(room.room_id)
 
@@ -1560,7 +1954,7 @@ class LiarsBarBasicPlugin(Star):
         room.wire_deadline_ts = time.time() + self._wire_timeout_seconds()
         self._arm_wire_timeout_task(room.room_id, room.action_token, punished_id, room.wire_deadline_ts)
 
-        options_text = " / ".join([f"{k}={v}" for k, v in room.wire_index_map.items()])
+        options_text = room.wire_opts_slash
         pname = self._display_player_name(room, punished_id)
 
         bomb_img = self.renderer.bomb_path_for_options(room.wire_options)
@@ -1570,8 +1964,8 @@ class LiarsBarBasicPlugin(Star):
         else:
             chain.append(Comp.At(qq=punished_id))
             chain.append(Comp.Plain(f" {pname} 进入剪线阶段。可选：{options_text}\n"))
-        if bomb_img and bomb_img.exists():
-            chain.append(Comp.Image.fromFileSystem(str(bomb_img)))
+        if bomb_img and (comp := self._image_comp(bomb_img)):
+            chain.append(comp)
         step = (
             "系统将自动为 AI 执行剪线。"
             if punished.is_ai
@@ -1601,7 +1995,7 @@ class LiarsBarBasicPlugin(Star):
         if not player:
             return update
 
-        options = room.wire_options.copy()
+        options = room.wire_options
         if color not in options:
             return update
 
@@ -1612,8 +2006,7 @@ class LiarsBarBasicPlugin(Star):
 
         room.phase = PHASE_PLAYING
         room.pending_wire_user_id = ""
-        room.wire_options = []
-        room.wire_index_map = {}
+        room.set_wire_options(())
         room.wire_deadline_ts = 0
         self._cancel_wire_timeout_task(room.room_id)
 
@@ -1621,15 +2014,13 @@ class LiarsBarBasicPlugin(Star):
         prefix = "[超时自动剪线] " if by_timeout else ""
 
         if exploded:
-            player.alive = False
-            player.hand = []
+            room.eliminate(user_id)
             text = f"{prefix}{who} 剪到【{color}线】并触发爆炸，已出局。"
             if taunt_line:
                 text = f"{text}\n{taunt_line}"
             chain: list[Any] = [Comp.Plain(text)]
-            explode = self.renderer.bomb_explode_path()
-            if explode.exists():
-                chain.append(Comp.Image.fromFileSystem(str(explode)))
+            if comp := self._image_comp(self.renderer.bomb_explode_path()):
+                chain.append(comp)
             chain.append(Comp.Plain(self._guide("", "本小局结束，系统将开始下一小局。")))
             update.outbox.append((room.group_umo, chain))
         else:
@@ -1669,9 +2060,8 @@ class LiarsBarBasicPlugin(Star):
         if len(alive_ids) <= 1:
             return self._announce_winner_and_close_locked(room, reason="仅剩一名玩家")
 
-        for uid in room.order:
-            if uid in room.players:
-                room.players[uid].hand = []
+        for player in room.order_players:
+            player.hand = []
 
         hand_size = max(1, int(room.fixed_hand_size or FIXED_HAND_SIZE))
         deck = self._build_round_deck(room)
@@ -1685,10 +2075,11 @@ class LiarsBarBasicPlugin(Star):
             )
             self._drop_room_locked(room.room_id)
             return update
+        self._partial_shuffle_prefix(deck, need)
+        cursor = 0
         for uid in alive_ids:
-            take = deck[:hand_size]
-            deck = deck[hand_size:]
-            room.players[uid].hand = take
+            room.players[uid].hand = deck[cursor : cursor + hand_size]
+            cursor += hand_size
 
         room.round_no += 1
         room.target_card = random.choice(TARGET_CARDS)
@@ -1699,8 +2090,7 @@ class LiarsBarBasicPlugin(Star):
         room.last_play = None
         room.phase = PHASE_PLAYING
         room.pending_wire_user_id = ""
-        room.wire_options = []
-        room.wire_index_map = {}
+        room.set_wire_options(())
         room.wire_deadline_ts = 0
 
         room.action_token += 1
@@ -1713,9 +2103,8 @@ class LiarsBarBasicPlugin(Star):
 
         pool_text = self._card_pool_text(room)
         chain: list[Any] = [Comp.Plain(f"第 {room.round_no} 小局开始（{reason}）。目标牌：{target_name}\n{pool_text}\n")]
-        target_img = self.renderer.target_path(room.target_card)
-        if target_img.exists():
-            chain.append(Comp.Image.fromFileSystem(str(target_img)))
+        if comp := self._image_comp(self.renderer.target_path(room.target_card)):
+            chain.append(comp)
         starter_player = room.players.get(starter)
         if starter_player and starter_player.is_ai:
             start_line = self._build_ai_taunt_line(room, starter, "turn_start")
@@ -1730,7 +2119,7 @@ class LiarsBarBasicPlugin(Star):
             )
         )
         update.outbox.append((room.group_umo, chain))
-        update.hand_push.extend([uid for uid in alive_ids if uid in room.players and not room.players[uid].is_ai])
+        update.hand_push.extend([uid for uid in alive_ids if (p := room.players.get(uid)) and not p.is_ai])
         return update
 
     def _announce_winner_and_close_locked(self, room: RoomState, reason: str) -> RoundUpdate:
@@ -1749,36 +2138,30 @@ class LiarsBarBasicPlugin(Star):
         self._drop_room_locked(room.room_id)
         return update
 
-    async def _send_private_hand(self, room: RoomState, user_id: str, force_tip: bool) -> None:
-        player = room.players.get(user_id)
-        if not player:
-            return
-        if player.is_ai:
+    async def _send_private_hand_view(self, view: HandView, force_tip: bool) -> None:
+        if view.is_ai:
             return
 
-        if not player.alive:
+        if not view.alive:
             await self._send_private_text(
-                room,
-                user_id,
+                view.platform_id,
+                view.user_id,
                 self._guide("你已出局，当前无法出牌。", "等待本局结束后在群里重新开房。"),
+                session=view.private_umo,
             )
             return
 
         hand_img = self.renderer.build_hand_image(
-            room_id=room.room_id,
-            user_id=user_id,
-            cards=player.hand,
+            room_id=view.room_id,
+            user_id=view.user_id,
+            cards=view.hand,
             width_hint=int(self.conf.get("hand_image_width", 960)),
         )
 
-        card_list = []
-        for idx, code in enumerate(player.hand, start=1):
-            card_list.append(f"{idx}:{CARD_NAME.get(code, code)}")
-
         info = (
-            f"当前房间群号：{room.group_id}\n"
-            f"目标牌：{CARD_NAME.get(room.target_card, room.target_card)}\n"
-            f"你的手牌：{'  '.join(card_list) if card_list else '无'}"
+            f"当前房间群号：{view.group_id}\n"
+            f"目标牌：{CARD_NAME.get(view.target_card, view.target_card)}\n"
+            f"你的手牌：{_render_hand_list(tuple(view.hand)) if view.hand else '无'}"
         )
 
         next_tip = "若轮到你，发送 /酒馆 出 2 4 5。也可随时发送 /酒馆 手牌 重新查看。"
@@ -1787,7 +2170,7 @@ class LiarsBarBasicPlugin(Star):
         elif bool(self.conf.get("guide_mode", True)):
             info = f"{info}\n\n下一步：{next_tip}"
 
-        await self._send_private_text(room, user_id, info, image_path=hand_img)
+        await self._send_private_text(view.platform_id, view.user_id, info, image_path=hand_img, session=view.private_umo)
 
     async def _probe_private_reachable(self, platform_id: str, user_id: str) -> bool:
         text = "[酒馆连通检查] 收到这条消息代表私聊通道可用。"
@@ -1798,33 +2181,24 @@ class LiarsBarBasicPlugin(Star):
         except Exception:
             return False
 
-    async def _send_rules_forward(self, room: RoomState) -> None:
-        pool_text = self._card_pool_text(room)
-        play_timeout = self._play_timeout_seconds()
-        wire_timeout = self._wire_timeout_seconds()
-        sections = [
-            "【酒馆基础规则】\n1) 每小局随机目标牌（太阳/月亮/星星），并给当前存活玩家每人固定发 5 张",
-            "2) 出牌在私聊完成，群里只公布宣称数量",
-            "3) 质疑规则：下一位可在群里 /酒馆 质疑\n4) 判定规则：暗牌中“任一假即判假”，魔术牌可当目标牌",
-            "5) 受罚进入剪线：三选一 -> 二选一 -> 一选一必爆\n6) 命令：/酒馆 剪线 红|蓝|黄（支持数字）",
-            f"7) 超时：出牌{play_timeout}秒超时直接整局淘汰；剪线{wire_timeout}秒超时自动剪线",
-            "8) 若玩家出完手牌，下家会被系统自动触发质疑",
-            "9) 全程一人一房，避免私聊串局",
-            "10) 等待阶段房主可 /酒馆 加AI 或 /酒馆 减AI，AI 会自动行动",
-            "11) 所有命令可随时用 /酒馆 帮助 查询",
-            f"12) 本大局牌池在开局时一次锁定，后续小局不变化。\n{pool_text}",
-        ]
+    async def _send_rules_forward(self, room: RoomSnapshot) -> None:
+        values = {
+            "pool_text": room.pool_text,
+            "play_timeout": self._play_timeout_seconds(),
+            "wire_timeout": self._wire_timeout_seconds(),
+        }
+        sections = [section.format_map(values) if "{" in section else section for section in RULES_SECTIONS]
 
         bot_uin = int(room.bot_id) if room.bot_id.isdigit() else int(room.owner_id)
         nodes = [Comp.Node(uin=bot_uin, name="酒馆规则", content=[Comp.Plain(s)]) for s in sections]
         ok = await self._send_to_umo(room.group_umo, [Comp.Nodes(nodes=nodes)])
         if not ok:
             fallback = "\n\n".join(sections)
-            await self._send_group_text(room, fallback)
+            await self._send_to_umo(room.group_umo, [Comp.Plain(fallback)])
 
     async def _handle_play_timeout(self, room_id: str, token: int, target_uid: str) -> None:
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room:
@@ -1842,8 +2216,7 @@ class LiarsBarBasicPlugin(Star):
             if not player or not player.alive:
                 return
 
-            player.alive = False
-            player.hand = []
+            room.eliminate(target_uid)
             room.play_deadline_ts = 0
             self._cancel_play_timeout_task(room_id)
 
@@ -1871,15 +2244,14 @@ class LiarsBarBasicPlugin(Star):
                 next_update = self._start_new_round_locked(room, reason="超时淘汰结算")
                 update.outbox.extend(next_update.outbox)
                 update.hand_push.extend(next_update.hand_push)
-            room.updated_at = time.time()
-            await self._save_state_locked()
-            if room.room_id in self.rooms:
-                room_snapshot = copy.deepcopy(room)
+            self._touch_room_locked(room)
+            self._save_state_locked()
+            room_snapshot = self._dispatch_snapshot_locked(room, update)
         await self._dispatch_round_update(room_snapshot, update)
 
     async def _handle_wire_timeout(self, room_id: str, token: int, target_uid: str) -> None:
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room:
@@ -1895,61 +2267,70 @@ class LiarsBarBasicPlugin(Star):
 
             if not room.wire_options:
                 update = self._start_new_round_locked(room, reason="剪线状态修复")
-                await self._save_state_locked()
+                self._save_state_locked()
             else:
                 picked = random.choice(room.wire_options)
                 update = self._apply_wire_cut_locked(room, target_uid, picked, by_timeout=True)
-                room.updated_at = time.time()
-                await self._save_state_locked()
-            if room.room_id in self.rooms:
-                room_snapshot = copy.deepcopy(room)
+                self._touch_room_locked(room)
+                self._save_state_locked()
+            room_snapshot = self._dispatch_snapshot_locked(room, update)
         await self._dispatch_round_update(room_snapshot, update)
 
     def _arm_play_timeout_task(self, room_id: str, token: int, target_uid: str, deadline_ts: float) -> None:
-        self._cancel_play_timeout_task(room_id)
-        delay = max(0.0, deadline_ts - time.time())
+        # Re-scheduling the same key replaces the previous entry, which cancels it.
+        self.timer_wheel.schedule((room_id, TIMER_PLAY), deadline_ts, (token, target_uid))
 
-        async def runner():
-            try:
-                await asyncio.sleep(delay)
-                await self._handle_play_timeout(room_id, token, target_uid)
-            except asyncio.CancelledError:
-                return
-            except Exception as exc:
-                logger.error(f"酒馆出牌超时任务异常: {exc}")
+    def _arm_wire_timeout_task(self, room_id: str, token: int, target_uid: str, deadline_ts: float) -> None:
+        self.timer_wheel.schedule((room_id, TIMER_WIRE), deadline_ts, (token, target_uid))
 
-        self.play_timeout_tasks[room_id] = asyncio.create_task(runner())
+    def _cancel_play_timeout_task(self, room_id: str) -> None:
+        self.timer_wheel.cancel((room_id, TIMER_PLAY))
 
-    def _arm_wire_timeout_task(self, room_id: str, token: int, target_uid: str, deadline_ts: float) -> None:
-        self._cancel_wire_timeout_task(room_id)
-        delay = max(0.0, deadline_ts - time.time())
+    def _cancel_wire_timeout_task(self, room_id: str) -> None:
+        self.timer_wheel.cancel((room_id, TIMER_WIRE))
 
+    def _arm_timer_tick(self) -> None:
+        # Self-rearming loop callback: no Task or coroutine frame is kept alive between ticks.
+        self.timer_handle = asyncio.get_running_loop().call_later(TIMER_TICK_SECONDS, self._on_timer_tick)
+
+    def _on_timer_tick(self) -> None:
+        try:
+            self._fire_due_timers(time.time())
+        except Exception as exc:
+            logger.error(f"酒馆计时轮异常: {exc}")
+        finally:
+            self._arm_timer_tick()
+
+    def _fire_due_timers(self, now: float) -> None:
+        for (room_id, kind), _, (token, target_uid) in self.timer_wheel.advance(now):
+            if kind == TIMER_PLAY:
+                self._spawn_timer_handler(self._handle_play_timeout(room_id, token, target_uid), "酒馆出牌超时任务异常")
+            else:
+                self._spawn_timer_handler(self._handle_wire_timeout(room_id, token, target_uid), "酒馆剪线超时任务异常")
+
+        expired = [room_id for room_id, _, _ in self.ttl_wheel.advance(now)]
+        if expired:
+            self._spawn_timer_handler(self._expire_idle_rooms(expired), "酒馆清理任务异常")
+
+    def _spawn_timer_handler(self, handler: Any, error_label: str) -> None:
         async def runner():
             try:
-                await asyncio.sleep(delay)
-                await self._handle_wire_timeout(room_id, token, target_uid)
+                await handler
             except asyncio.CancelledError:
                 return
             except Exception as exc:
-                logger.error(f"酒馆剪线超时任务异常: {exc}")
+                logger.error(f"{error_label}: {exc}")
 
-        self.wire_timeout_tasks[room_id] = asyncio.create_task(runner())
+        task = asyncio.create_task(runner())
+        self.timer_handler_tasks.add(task)
+        task.add_done_callback(self.timer_handler_tasks.discard)
 
-    def _cancel_play_timeout_task(self, room_id: str) -> None:
-        task = self.play_timeout_tasks.pop(room_id, None)
-        current_task: Optional[asyncio.Task] = None
-        with contextlib.suppress(RuntimeError):
-            current_task = asyncio.current_task()
-        if task and task is not current_task:
-            task.cancel()
-
-    def _cancel_wire_timeout_task(self, room_id: str) -> None:
-        task = self.wire_timeout_tasks.pop(room_id, None)
-        current_task: Optional[asyncio.Task] = None
-        with contextlib.suppress(RuntimeError):
-            current_task = asyncio.current_task()
-        if task and task is not current_task:
-            task.cancel()
+    def _touch_room_locked(self, room: RoomState) -> None:
+        room.updated_at = time.time()
+        if room.phase == PHASE_WAITING:
+            self.ttl_wheel.schedule(room.room_id, room.updated_at + self._room_ttl_seconds(), None)
+        else:
+            self.ttl_wheel.cancel(room.room_id)
 
     def _cancel_ai_action_task_locked(self, room_id: str) -> None:
         task = self.ai_action_tasks.pop(room_id, None)
@@ -1968,15 +2349,37 @@ class LiarsBarBasicPlugin(Star):
         self._cancel_play_timeout_task(room_id)
         self._cancel_wire_timeout_task(room_id)
         self._cancel_ai_action_task_locked(room_id)
+        self.ttl_wheel.cancel(room_id)
+        self._ai_prompt_preambles.pop(room_id, None)
+        for task in self._ai_prefetch_tasks.pop(room_id, ()):
+            task.cancel()
 
-        for uid, rid in list(self.player_room_index.items()):
-            if rid == room_id:
+        for uid in self.room_player_index.pop(room_id, ()):
+            if self.player_room_index.get(uid) == room_id:
                 self.player_room_index.pop(uid, None)
 
+    def _index_player_locked(self, user_id: str, room_id: str) -> None:
+        self._unindex_player_locked(user_id)
+        self.player_room_index[user_id] = room_id
+        self.room_player_index.setdefault(room_id, set()).add(user_id)
+
+    def _unindex_player_locked(self, user_id: str) -> None:
+        old_room = self.player_room_index.pop(user_id, None)
+        if old_room is None:
+            return
+        members = self.room_player_index.get(old_room)
+        if members is not None:
+            members.discard(user_id)
+            if not members:
+                self.room_player_index.pop(old_room, None)
+
     async def _resume_timers(self) -> None:
+        ttl_seconds = self._room_ttl_seconds()
         async with self.state_lock:
             for room in self.rooms.values():
-                if room.phase == PHASE_PLAYING and room.current_turn_user_id and room.play_deadline_ts > 0:
+                if room.phase == PHASE_WAITING:
+                    self.ttl_wheel.schedule(room.room_id, room.updated_at + ttl_seconds, None)
+                elif room.phase == PHASE_PLAYING and room.current_turn_user_id and room.play_deadline_ts > 0:
                     self._arm_play_timeout_task(
                         room.room_id,
                         room.action_token,
@@ -1991,75 +2394,100 @@ class LiarsBarBasicPlugin(Star):
                         room.wire_deadline_ts,
                     )
 
-    async def _cleanup_loop(self) -> None:
-        while True:
-            try:
-                await asyncio.sleep(300)
-                await self._cleanup_rooms()
-            except asyncio.CancelledError:
-                break
-            except Exception as exc:
-                logger.error(f"酒馆清理任务异常: {exc}")
-
-    async def _cleanup_rooms(self) -> None:
-        ttl_seconds = max(60, int(self.conf.get("room_ttl_minutes", 180)) * 60)
+    async def _expire_idle_rooms(self, room_ids: list[str]) -> None:
+        ttl_seconds = self._room_ttl_seconds()
         now = time.time()
         outbox: list[tuple[str, list[Any]]] = []
         async with self.state_lock:
-            stale = [
-                rid
-                for rid, room in self.rooms.items()
-                if room.phase == PHASE_WAITING and now - room.updated_at >= ttl_seconds
-            ]
-            if not stale:
-                return
-
-            for rid in stale:
+            for rid in room_ids:
                 room = self.rooms.get(rid)
-                if room:
-                    outbox.append((room.group_umo, [Comp.Plain("房间等待超时已自动关闭。")]))
+                if not room or room.phase != PHASE_WAITING:
+                    continue
+                if now - room.updated_at < ttl_seconds:
+                    self.ttl_wheel.schedule(rid, room.updated_at + ttl_seconds, None)
+                    continue
+                outbox.append((room.group_umo, [Comp.Plain("房间等待超时已自动关闭。")]))
                 self._drop_room_locked(rid)
 
-            await self._save_state_locked()
-        if outbox:
-            await self._flush_outbox(outbox)
+            if not outbox:
+                return
+            self._save_state_locked()
+        await self._flush_outbox(outbox)
 
     async def _flush_outbox(self, outbox: list[tuple[str, list[Any]]]) -> None:
+        # Coalesce all chains bound for one destination into a single message (kept in queue order);
+        # different destinations are sent concurrently.
+        merged: dict[str, list[Any]] = {}
         for umo, chain in outbox:
-            await self._send_to_umo(umo, chain)
+            target = merged.get(umo)
+            if target is None:
+                merged[umo] = list(chain)
+            else:
+                target.append(Comp.Plain("\n"))
+                target.extend(chain)
+
+        if len(merged) <= 1:
+            for umo, chain in merged.items():
+                await self._send_to_umo(umo, chain)
+            return
+        await asyncio.gather(
+            *(self._send_to_umo(umo, chain) for umo, chain in merged.items()),
+            return_exceptions=True,
+        )
+
+    def _dispatch_snapshot_locked(self, room: RoomState, update: RoundUpdate) -> Optional[RoomSnapshot]:
+        # Closed rooms and rounds with nothing to push or kick need no snapshot at all.
+        if room.room_id not in self.rooms:
+            return None
+        if not update.hand_push and room.phase not in (PHASE_PLAYING, PHASE_AWAIT_WIRE):
+            return None
+        return room.snapshot_for_dispatch(set(update.hand_push))
 
-    async def _dispatch_round_update(self, room_snapshot: Optional[RoomState], update: RoundUpdate) -> None:
+    async def _dispatch_round_update(self, room_snapshot: Optional[RoomSnapshot], update: RoundUpdate) -> None:
         if update.outbox:
             await self._flush_outbox(update.outbox)
-        if room_snapshot and update.hand_push:
-            for uid in update.hand_push:
-                player = room_snapshot.players.get(uid)
-                if player and player.is_ai:
-                    continue
-                try:
-                    await self._send_private_hand(room_snapshot, uid, force_tip=False)
-                except Exception:
-                    await self._send_to_umo(
-                        room_snapshot.group_umo,
-                        [
-                            Comp.At(qq=uid),
-                            Comp.Plain(" 私聊发牌失败，请先加好友并私聊机器人一次。"),
-                        ],
-                    )
+        if room_snapshot and room_snapshot.hands:
+            push_uids = list(room_snapshot.hands)
+            results = await asyncio.gather(
+                *(self._send_private_hand_view(view, force_tip=False) for view in room_snapshot.hands.values()),
+                return_exceptions=True,
+            )
+            failed: list[tuple[str, list[Any]]] = [
+                (
+                    room_snapshot.group_umo,
+                    [
+                        Comp.At(qq=uid),
+                        Comp.Plain(" 私聊发牌失败，请先加好友并私聊机器人一次。"),
+                    ],
+                )
+                for uid, result in zip(push_uids, results)
+                if isinstance(result, Exception)
+            ]
+            if failed:
+                await self._flush_outbox(failed)
         if room_snapshot:
             await self._kick_ai_if_needed(room_snapshot.room_id)
 
-    async def _send_group_text(self, room: RoomState, text: str) -> None:
-        await self._send_to_umo(room.group_umo, [Comp.Plain(text)])
+    def _image_comp(self, path: Path) -> Optional[Any]:
+        # Static assets only (target/bomb images); per-player hand images are rendered fresh and not cached here.
+        key = str(path)
+        if comp := self._image_comps.get(key):
+            return comp
+        if not path.exists():
+            return None
+        comp = Comp.Image.fromFileSystem(key)
+        self._image_comps[key] = comp
+        return comp
 
     async def _send_private_text(
         self,
-        room: RoomState,
+        platform_id: str,
         user_id: str,
         text: str,
         image_path: Optional[Path] = None,
+        session: str = "",
     ) -> None:
-        session = self._private_umo(room.platform_id, user_id)
+        session = session or self._private_umo(platform_id, user_id)
         chain: list[Any] = [Comp.Plain(text)]
         if image_path and image_path.exists():
             chain.append(Comp.Image.fromFileSystem(str(image_path)))
@@ -2108,9 +2536,9 @@ class LiarsBarBasicPlugin(Star):
         alive = room.alive_ids()
         if len(alive) <= 1:
             return None
-        if user_id not in alive:
+        idx = room.alive_position(user_id)
+        if idx < 0:
             return alive[0]
-        idx = alive.index(user_id)
         return alive[(idx + 1) % len(alive)]
 
     def _display_player_name(self, room: RoomState, user_id: str) -> str:
@@ -2125,7 +2553,7 @@ class LiarsBarBasicPlugin(Star):
         if not args:
             return default
         raw = args[0].strip()
-        if not re.fullmatch(r"\d+", raw):
+        if not _DIGITS_RE.fullmatch(raw):
             return None
         value = int(raw)
         if value <= 0:
@@ -2153,13 +2581,13 @@ class LiarsBarBasicPlugin(Star):
                 values.append(item)
                 continue
             if isinstance(item, float):
-                if int(item) != item:
+                if not item.is_integer():
                     return None
                 values.append(int(item))
                 continue
             if isinstance(item, str):
                 text = item.strip()
-                if not re.fullmatch(r"\d+", text):
+                if not _DIGITS_RE.fullmatch(text):
                     return None
                 values.append(int(text))
                 continue
@@ -2183,7 +2611,7 @@ class LiarsBarBasicPlugin(Star):
         parsed = self._normalize_indices(args, max_size)
         if parsed is None:
             for item in args:
-                if not re.fullmatch(r"\d+", str(item).strip()):
+                if not _DIGITS_RE.fullmatch(str(item).strip()):
                     return "序号必须是正整数。"
             if len(args) != len(set(args)):
                 return "序号不能重复。"
@@ -2194,13 +2622,13 @@ class LiarsBarBasicPlugin(Star):
 
     def _resolve_wire_arg(self, raw: str, room: RoomState) -> Optional[str]:
         text = raw.strip().lower()
-        if text in room.wire_index_map:
-            return room.wire_index_map[text]
+        if len(text) == 1 and "1" <= text <= str(len(room.wire_options)):
+            return room.wire_options[int(text) - 1]
 
-        text = text.replace("线", "").replace("色", "")
+        text = text.translate(_WIRE_STRIP)
         if text in WIRE_ALIASES:
             picked = WIRE_ALIASES[text]
-            if picked in room.wire_options:
+            if picked in room.wire_options_set:
                 return picked
         return None
 
@@ -2222,15 +2650,9 @@ class LiarsBarBasicPlugin(Star):
                 self._cancel_ai_action_task_locked(room_id)
                 return
 
-            should_run = False
-            if room.phase == PHASE_PLAYING:
-                actor = room.players.get(room.current_turn_user_id)
-                should_run = bool(actor and actor.is_ai and actor.alive)
-            elif room.phase == PHASE_AWAIT_WIRE:
-                actor = room.players.get(room.pending_wire_user_id)
-                should_run = bool(actor and actor.is_ai and actor.alive)
-
-            if not should_run:
+            actor_uid = room.acting_user_id()
+            actor = room.players.get(actor_uid) if actor_uid else None
+            if not actor or not actor.is_ai or not actor.alive:
                 self._cancel_ai_action_task_locked(room_id)
                 return
 
@@ -2267,22 +2689,12 @@ class LiarsBarBasicPlugin(Star):
             room = self.rooms.get(room_id)
             if not room or room.action_token != token:
                 return
-            if room.phase == PHASE_PLAYING:
-                actor = room.players.get(room.current_turn_user_id)
-                if not actor or not actor.is_ai or not actor.alive:
-                    return
-                phase = PHASE_PLAYING
-                ai_uid = room.current_turn_user_id
-                snapshot = copy.deepcopy(room)
-            elif room.phase == PHASE_AWAIT_WIRE:
-                actor = room.players.get(room.pending_wire_user_id)
-                if not actor or not actor.is_ai or not actor.alive:
-                    return
-                phase = PHASE_AWAIT_WIRE
-                ai_uid = room.pending_wire_user_id
-                snapshot = copy.deepcopy(room)
-            else:
+            ai_uid = room.acting_user_id()
+            actor = room.players.get(ai_uid) if ai_uid else None
+            if not actor or not actor.is_ai or not actor.alive:
                 return
+            phase = room.phase
+            snapshot = room.snapshot()
 
         if not snapshot:
             return
@@ -2290,27 +2702,31 @@ class LiarsBarBasicPlugin(Star):
         decision: dict[str, Any] = {}
         if phase == PHASE_PLAYING:
             decision = await self._decide_ai_action(snapshot, ai_uid)
+            # Overlap the next AI's LLM call with applying and announcing this play.
+            self._prefetch_next_ai_decision(snapshot, ai_uid, decision)
         else:
-            options = snapshot.wire_options.copy()
+            options = snapshot.wire_options
             if options:
-                decision = {"action": "wire", "color": random.choice(options)}
+                decision = {"action": "wire", "color": self._rng.choice(options)}
             else:
                 decision = {"action": "wire", "color": ""}
 
         update = RoundUpdate()
-        room_snapshot: Optional[RoomState] = None
+        room_snapshot: Optional[RoomSnapshot] = None
         changed = False
 
         async with self.state_lock:
             room = self.rooms.get(room_id)
             if not room or room.action_token != token:
                 return
+            # Same token normally means same actor; re-check once in case state was repaired in between.
+            if room.phase != phase or room.acting_user_id() != ai_uid:
+                return
+            player = room.players.get(ai_uid)
+            if not player or not player.is_ai or not player.alive:
+                return
 
             if phase == PHASE_PLAYING:
-                player = room.players.get(ai_uid)
-                if room.phase != PHASE_PLAYING or room.current_turn_user_id != ai_uid or not player or not player.is_ai or not player.alive:
-                    return
-
                 action = str(decision.get("action", "")).lower()
                 if action == "challenge" and room.last_play:
                     taunt_line = self._build_ai_taunt_line(room, ai_uid, "challenge")
@@ -2323,17 +2739,18 @@ class LiarsBarBasicPlugin(Star):
                     update.hand_push.extend(decision_update.hand_push)
                     changed = True
                 else:
+                    max_cards = min(self._ai_max_play_cards(), len(player.hand))
                     norm = self._normalize_indices(
                         list(decision.get("indices", []) or []),
                         len(player.hand),
-                        max_cards=min(self._ai_max_play_cards(), len(player.hand)),
+                        max_cards=max_cards,
                     )
                     if not norm:
                         fallback = self._fallback_ai_decision(room, ai_uid)
                         norm = self._normalize_indices(
                             list(fallback.get("indices", []) or []),
                             len(player.hand),
-                            max_cards=min(self._ai_max_play_cards(), len(player.hand)),
+                            max_cards=max_cards,
                         )
                     if not norm:
                         if room.last_play:
@@ -2358,14 +2775,9 @@ class LiarsBarBasicPlugin(Star):
                         update.hand_push.extend(decision_update.hand_push)
                         changed = True
             else:
-                player = room.players.get(ai_uid)
-                if room.phase != PHASE_AWAIT_WIRE or room.pending_wire_user_id != ai_uid or not player or not player.is_ai or not player.alive:
-                    return
                 picked = str(decision.get("color", "")).strip()
-                if picked not in room.wire_options and room.wire_options:
-                    picked = random.choice(room.wire_options)
-                if not picked and room.wire_options:
-                    picked = random.choice(room.wire_options)
+                if room.wire_options and picked not in room.wire_options_set:
+                    picked = self._rng.choice(room.wire_options)
                 if not picked:
                     repair = self._start_new_round_locked(room, reason="AI剪线状态修复")
                     update.outbox.extend(repair.outbox)
@@ -2379,10 +2791,9 @@ class LiarsBarBasicPlugin(Star):
                     changed = True
 
             if changed:
-                room.updated_at = time.time()
-                await self._save_state_locked()
-                if room.room_id in self.rooms:
-                    room_snapshot = copy.deepcopy(room)
+                self._touch_room_locked(room)
+                self._save_state_locked()
+                room_snapshot = self._dispatch_snapshot_locked(room, update)
 
         if changed:
             await self._dispatch_round_update(room_snapshot, update)
@@ -2390,7 +2801,7 @@ class LiarsBarBasicPlugin(Star):
     async def _decide_ai_action(self, room: RoomState, ai_uid: str) -> dict[str, Any]:
         fallback = self._fallback_ai_decision(room, ai_uid)
         provider_id = self._ai_provider_id()
-        if not provider_id:
+        if not provider_id or self._is_trivial_ai_turn(room, ai_uid):
             return fallback
 
         provider = self.context.get_provider_by_id(provider_id)
@@ -2402,62 +2813,207 @@ class LiarsBarBasicPlugin(Star):
             )
             return fallback
 
+        cache_key = self._ai_decision_key(room, ai_uid, provider_id)
+        parsed = self._cached_ai_decision(room, ai_uid, cache_key)
+        if not parsed and (pending := self._ai_inflight.get(cache_key)):
+            # A speculative request for exactly this state is already running; reuse its answer.
+            # wait() rather than shield(): the prefetch may be cancelled when its room is dropped.
+            await asyncio.wait({pending})
+            parsed = self._cached_ai_decision(room, ai_uid, cache_key)
+        if not parsed:
+            parsed = await self._request_ai_decision(provider, provider_id, room, ai_uid)
+            if parsed:
+                self._remember_ai_decision(room, ai_uid, cache_key, parsed)
+        if not parsed:
+            return fallback
+
+        if parsed.get("action") == "challenge" and room.last_play:
+            # Even when LLM says "challenge", keep a human-like uncertainty band to avoid perfect calls.
+            accept_prob = min(0.78, self._fair_challenge_probability(room, ai_uid, with_jitter=False) + 0.10)
+            if self._rng.random() > accept_prob:
+                return self._fallback_ai_decision(room, ai_uid, allow_challenge=False)
+        return parsed
+
+    def _is_trivial_ai_turn(self, room: RoomState, ai_uid: str) -> bool:
+        # Trivial-turn bypass: with a single card, or no truth cards in a small end game facing a claim,
+        # the rule strategy is as good as the model, so skip the provider round trip.
+        player = room.players.get(ai_uid)
+        if not player or len(player.hand) <= 1:
+            return True
+        if room.last_play and len(room.alive_ids()) <= 3:
+            truth_set = _truth_cards(room.target_card)
+            return not any(card in truth_set for card in player.hand)
+        return False
+
+    async def _request_ai_decision(self, provider: Any, provider_id: str, room: RoomState, ai_uid: str) -> Optional[dict[str, Any]]:
         prompt = self._build_ai_prompt(room, ai_uid)
         attempts = self._ai_llm_retry_times() + 1
-        for _ in range(attempts):
+        llm_timeout = self._ai_llm_timeout_seconds()
+        for attempt in range(attempts):
             try:
-                response = await asyncio.wait_for(
-                    provider.text_chat(prompt=prompt, session_id=None, contexts=[]),
-                    timeout=self._ai_llm_timeout_seconds(),
-                )
-                text = str(getattr(response, "completion_text", "") or "")
-                parsed = self._parse_ai_llm_decision(text, room, ai_uid)
-                if parsed:
-                    if parsed.get("action") == "challenge" and room.last_play:
-                        # Even when LLM says "challenge", keep a human-like uncertainty band to avoid perfect calls.
-                        accept_prob = min(0.78, self._fair_challenge_probability(room, ai_uid, with_jitter=False) + 0.10)
-                        if random.random() > accept_prob:
-                            return self._fallback_ai_decision(room, ai_uid, allow_challenge=False)
-                    return parsed
+                async with self._ai_llm_semaphore:
+                    response = await asyncio.wait_for(
+                        provider.text_chat(prompt=prompt, session_id=None, contexts=[]),
+                        timeout=llm_timeout,
+                    )
             except Exception as exc:
                 self._warn_once(
                     f"ai_provider_failed:{provider_id}",
                     f"酒馆AI调用 Provider 失败，改用规则策略: {exc}",
                     cooldown_seconds=30,
                 )
-        return fallback
+                # Timeouts/transport errors may be transient: back off outside the semaphore, then retry.
+                if attempt + 1 < attempts:
+                    await asyncio.sleep(2**attempt * 0.2)
+                continue
+            text = str(getattr(response, "completion_text", "") or "")
+            # An unparseable reply will not improve on a resend; go straight to the rule fallback.
+            return self._parse_ai_llm_decision(text, room, ai_uid)
+        return None
+
+    def _prefetch_next_ai_decision(self, room: RoomState, ai_uid: str, decision: dict[str, Any]) -> None:
+        # `room` is the caller's private snapshot; it is advanced in place to the expected post-play state.
+        provider_id = self._ai_provider_id()
+        if not provider_id or decision.get("action") != "play":
+            return
+        player = room.players.get(ai_uid)
+        if not player:
+            return
+        norm = self._normalize_indices(
+            list(decision.get("indices", []) or []),
+            len(player.hand),
+            max_cards=min(self._ai_max_play_cards(), len(player.hand)),
+        )
+        # Emptying the hand triggers an automatic challenge, not a decision by the next player.
+        if not norm or len(norm) >= len(player.hand):
+            return
+
+        played_cards = [player.hand[i - 1] for i in norm]
+        for idx in sorted(norm, reverse=True):
+            player.hand.pop(idx - 1)
+        room.last_play = LastPlay(player_id=ai_uid, cards=played_cards, declared_target=room.target_card, played_at=time.time())
+
+        next_uid = self._next_alive_after(room, ai_uid)
+        next_player = room.players.get(next_uid) if next_uid else None
+        # Trivial turns are answered by the rule strategy, so a prefetched reply would never be read.
+        if not next_player or not next_player.is_ai or self._is_trivial_ai_turn(room, next_uid):
+            return
+        key = self._ai_decision_key(room, next_uid, provider_id)
+        if key in self._ai_decision_cache or key in self._ai_inflight:
+            return
+        provider = self.context.get_provider_by_id(provider_id)
+        if not provider:
+            return
+
+        room_id = room.room_id
+
+        async def runner() -> None:
+            # The room may be dropped before this starts or while the provider call runs.
+            if room_id not in self.rooms:
+                return
+            parsed = await self._request_ai_decision(provider, provider_id, room, next_uid)
+            if parsed and room_id in self.rooms:
+                self._remember_ai_decision(room, next_uid, key, parsed)
+
+        task = asyncio.create_task(runner())
+        self._ai_inflight[key] = task
+        self._ai_prefetch_tasks.setdefault(room_id, set()).add(task)
+
+        def _done(done_task: asyncio.Task) -> None:
+            if self._ai_inflight.get(key) is done_task:
+                self._ai_inflight.pop(key, None)
+            if (room_tasks := self._ai_prefetch_tasks.get(room_id)) is not None:
+                room_tasks.discard(done_task)
+                if not room_tasks:
+                    self._ai_prefetch_tasks.pop(room_id, None)
+            if not done_task.cancelled() and done_task.exception():
+                logger.error(f"酒馆AI预判任务异常: {done_task.exception()}")
+
+        task.add_done_callback(_done)
+
+    def _ai_decision_key(self, room: RoomState, ai_uid: str, provider_id: str) -> tuple:
+        player = room.players.get(ai_uid)
+        hand = tuple(sorted(player.hand)) if player else ()
+        claim = len(room.last_play.cards) if room.last_play else -1
+        return (provider_id, room.target_card, hand, claim, len(room.alive_ids()))
+
+    def _cached_ai_decision(self, room: RoomState, ai_uid: str, key: tuple) -> Optional[dict[str, Any]]:
+        entry = self._ai_decision_cache.get(key)
+        if entry is None:
+            return None
+        self._ai_decision_cache.move_to_end(key)
+        action, truth_n, fake_n = entry
+        if action == "challenge":
+            return {"action": "challenge"} if room.last_play else None
+
+        # Indices are positional; re-draw the same truth/fake mix from the current hand.
+        player = room.players.get(ai_uid)
+        truth_indices, fake_indices = _split_truth_indices(player.hand if player else [], room.target_card)
+        if truth_n > len(truth_indices) or fake_n > len(fake_indices) or truth_n + fake_n <= 0:
+            return None
+        chosen = self._rng.sample(truth_indices, k=truth_n) + self._rng.sample(fake_indices, k=fake_n)
+        return {"action": "play", "indices": sorted(chosen)}
+
+    def _remember_ai_decision(self, room: RoomState, ai_uid: str, key: tuple, decision: dict[str, Any]) -> None:
+        if decision.get("action") == "challenge":
+            entry = ("challenge", 0, 0)
+        else:
+            player = room.players.get(ai_uid)
+            hand = player.hand if player else []
+            truth = _truth_cards(room.target_card)
+            picked = [hand[idx - 1] for idx in decision.get("indices", []) if 0 < idx <= len(hand)]
+            truth_n = sum(1 for card in picked if card in truth)
+            entry = ("play", truth_n, len(picked) - truth_n)
+        self._ai_decision_cache[key] = entry
+        self._ai_decision_cache.move_to_end(key)
+        while len(self._ai_decision_cache) > AI_DECISION_CACHE_SIZE:
+            self._ai_decision_cache.popitem(last=False)
+
+    def _ai_prompt_preamble(self, room: RoomState) -> tuple[str, str]:
+        # Target and roster lines only change with target/membership/alive flips; reuse them across turns.
+        state_key = (
+            room.target_card,
+            tuple((p.user_id, p.name, p.is_ai, p.alive) for p in room.order_players),
+        )
+        cached = self._ai_prompt_preambles.get(room.room_id)
+        if cached and cached[0] == state_key:
+            return cached[1], cached[2]
+
+        # Same text as _display_player_name, built from the key tuple in one pass.
+        roster = "；".join(
+            f"{name}[AI]({'存活' if alive else '出局'})" if is_ai else f"{name}({'存活' if alive else '出局'})"
+            for _, name, is_ai, alive in state_key[1]
+        )
+        head = "\n".join(
+            [
+                "你是骗子酒馆的 AI 玩家，只输出 JSON，不要解释。",
+                "你只能根据公开信息和你自己的手牌决策，绝不能假设看到了他人暗牌。",
+                f"当前目标牌：{CARD_NAME.get(room.target_card, room.target_card)}；魔术牌可当目标牌。",
+            ]
+        )
+        roster_line = f"存活人数：{len(room.alive_ids())}，玩家列表：{roster}"
+        self._ai_prompt_preambles[room.room_id] = (state_key, head, roster_line)
+        return head, roster_line
 
     def _build_ai_prompt(self, room: RoomState, ai_uid: str) -> str:
         player = room.players.get(ai_uid)
         hand = list(player.hand) if player else []
         readable_hand = [f"{idx + 1}:{CARD_NAME.get(card, card)}" for idx, card in enumerate(hand)]
-        alive = room.alive_ids()
-        roster = []
-        for uid in room.order:
-            p = room.players.get(uid)
-            if not p:
-                continue
-            status = "出局" if not p.alive else "存活"
-            roster.append(f"{self._display_player_name(room, uid)}({status})")
+        head, roster_line = self._ai_prompt_preamble(room)
 
         lines = [
-            "你是骗子酒馆的 AI 玩家，只输出 JSON，不要解释。",
-            "你只能根据公开信息和你自己的手牌决策，绝不能假设看到了他人暗牌。",
-            f"当前目标牌：{CARD_NAME.get(room.target_card, room.target_card)}；魔术牌可当目标牌。",
+            head,
             f"你的手牌：{', '.join(readable_hand) if readable_hand else '空'}",
-            f"存活人数：{len(alive)}，玩家列表：{'；'.join(roster)}",
+            roster_line,
         ]
+        max_play = min(self._ai_max_play_cards(), max(1, len(hand)))
         if room.last_play:
             lines.append(
                 f"上一手：{self._display_player_name(room, room.last_play.player_id)} 宣称出了 {len(room.last_play.cards)} 张目标牌。"
             )
-            lines.append(
-                f"你可选动作：challenge 或 play。play 最多 {min(self._ai_max_play_cards(), max(1, len(hand)))} 张。"
-            )
+            lines.append(f"你可选动作：challenge 或 play。play 最多 {max_play} 张。")
         else:
-            lines.append(
-                f"你可选动作：仅 play。play 最多 {min(self._ai_max_play_cards(), max(1, len(hand)))} 张。"
-            )
+            lines.append(f"你可选动作：仅 play。play 最多 {max_play} 张。")
         lines.append('输出格式：{"action":"play","indices":[1,2]} 或 {"action":"challenge"}')
         return "\n".join(lines)
 
@@ -2493,44 +3049,36 @@ class LiarsBarBasicPlugin(Star):
 
     def _extract_json_dict(self, text: str) -> Optional[dict[str, Any]]:
         content = text.strip()
-        fence = re.search(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", content, flags=re.IGNORECASE)
-        candidates = [fence.group(1)] if fence else []
-        candidates.append(content)
-        brace = re.search(r"\{[\s\S]*\}", content)
-        if brace:
-            candidates.append(brace.group(0))
-
-        for candidate in candidates:
-            try:
-                data = json.loads(candidate)
+        # Fast path: clean JSON output.
+        if content.startswith("{"):
+            with contextlib.suppress(Exception):
+                data = json.loads(content)
                 if isinstance(data, dict):
                     return data
-            except Exception:
-                continue
-        return None
+
+        # A ```json fence narrows the scan; otherwise scan the whole reply.
+        fence = content.find("```")
+        if fence >= 0:
+            body_start = fence + 3
+            if content[body_start : body_start + 4].lower() == "json":
+                body_start += 4
+            body_end = content.find("```", body_start)
+            if body_end > body_start:
+                data = _scan_json_dict(content[body_start:body_end])
+                if data is not None:
+                    return data
+        return _scan_json_dict(content)
 
     def _fair_challenge_probability(self, room: RoomState, ai_uid: str, with_jitter: bool = True) -> float:
         if not room.last_play:
             return 0.0
         player = room.players.get(ai_uid)
-        hand = list(player.hand) if player else []
-        truth_count = sum(1 for card in hand if card in {room.target_card, CARD_MAGIC})
-        fake_count = len(hand) - truth_count
-        claim_count = len(room.last_play.cards)
-        alive_n = len(room.alive_ids())
-
-        prob = 0.12
-        prob += min(0.20, max(0, claim_count - 1) * 0.09)
-        if truth_count == 0:
-            prob += 0.10
-        elif truth_count >= 3 and claim_count <= 1:
-            prob -= 0.05
-        if fake_count == 0 and claim_count >= 2:
-            prob += 0.04
-        if alive_n <= 3:
-            prob += 0.06
+        hand = player.hand if player else []
+        truth_set = _truth_cards(room.target_card)
+        truth_count = sum(1 for card in hand if card in truth_set)
+        prob = _challenge_score(truth_count, len(hand) - truth_count, len(room.last_play.cards), len(room.alive_ids()))
         if with_jitter:
-            prob += random.uniform(-0.10, 0.10)
+            prob += self._rng.uniform(-0.10, 0.10)
         return max(0.08, min(0.62, prob))
 
     def _fallback_ai_decision(self, room: RoomState, ai_uid: str, allow_challenge: bool = True) -> dict[str, Any]:
@@ -2538,69 +3086,61 @@ class LiarsBarBasicPlugin(Star):
         if not player:
             return {"action": "challenge"} if room.last_play else {"action": "play", "indices": [1]}
 
-        hand = list(player.hand)
+        hand = player.hand
         hand_size = len(hand)
         if hand_size <= 0:
             return {"action": "challenge"} if room.last_play else {"action": "play", "indices": [1]}
 
-        truth_indices = [idx + 1 for idx, card in enumerate(hand) if card in {room.target_card, CARD_MAGIC}]
-        fake_indices = [idx + 1 for idx, card in enumerate(hand) if card not in {room.target_card, CARD_MAGIC}]
+        truth_indices, fake_indices = _split_truth_indices(hand, room.target_card)
 
         if allow_challenge and room.last_play:
             challenge_prob = self._fair_challenge_probability(room, ai_uid, with_jitter=True)
-            if random.random() < challenge_prob:
+            if self._rng.random() < challenge_prob:
                 return {"action": "challenge"}
 
         max_play = min(self._ai_max_play_cards(), hand_size)
-        play_count = random.randint(1, max_play)
+        play_count = self._rng.randint(1, max_play)
         chosen: list[int] = []
 
         if truth_indices:
             pick_truth = min(len(truth_indices), play_count)
-            if fake_indices and play_count > 1 and room.last_play and random.random() < 0.35:
+            if fake_indices and play_count > 1 and room.last_play and self._rng.random() < 0.35:
                 pick_truth = max(1, pick_truth - 1)
-            chosen.extend(random.sample(truth_indices, k=pick_truth))
+            chosen.extend(self._rng.sample(truth_indices, k=pick_truth))
 
         remaining_slots = play_count - len(chosen)
-        remaining_pool = [idx for idx in range(1, hand_size + 1) if idx not in chosen]
+        chosen_set = set(chosen)
+        remaining_pool = [idx for idx in range(1, hand_size + 1) if idx not in chosen_set]
         if remaining_slots > 0 and remaining_pool:
-            chosen.extend(random.sample(remaining_pool, k=min(remaining_slots, len(remaining_pool))))
+            chosen.extend(self._rng.sample(remaining_pool, k=min(remaining_slots, len(remaining_pool))))
 
         if not chosen:
-            chosen = random.sample(list(range(1, hand_size + 1)), k=min(play_count, hand_size))
+            chosen = self._rng.sample(range(1, hand_size + 1), k=min(play_count, hand_size))
         return {"action": "play", "indices": sorted(chosen)}
 
     def _build_ai_taunt_line(self, room: RoomState, ai_uid: str, action: str) -> str:
         if not self._ai_taunt_enabled():
             return ""
-        pool = AI_TAUNTS.get(action, [])
-        minimal_pool = AI_TAUNTS_MINIMAL.get(action, [])
-        text = ""
-        if pool and random.random() <= self._ai_taunt_probability():
-            text = random.choice(pool).strip()
-        elif minimal_pool:
-            # Keep AI speech stable: even when probability misses, emit a short baseline line.
-            text = random.choice(minimal_pool).strip()
-        elif pool:
-            text = random.choice(pool).strip()
-        if len(text) > 20:
-            text = text[:20]
-        if not text:
+        pool = AI_TAUNTS.get(action, ())
+        minimal_pool = AI_TAUNTS_MINIMAL.get(action, ())
+        # Keep AI speech stable: even when probability misses, emit a short baseline line.
+        if pool and (not minimal_pool or self._rng.random() <= self._ai_taunt_probability()):
+            chosen = pool
+        else:
+            chosen = minimal_pool
+        if not chosen:
             return ""
-        return f"{self._display_player_name(room, ai_uid)}：{text}"
+        return f"{self._display_player_name(room, ai_uid)}：{self._rng.choice(chosen)}"
 
     def _phase_label(self, phase: str) -> str:
-        return {
-            PHASE_WAITING: "等待开局",
-            PHASE_PLAYING: "出牌/质疑",
-            PHASE_AWAIT_WIRE: "剪线结算",
-        }.get(phase, phase)
+        return _PHASE_LABELS.get(phase, phase)
 
     def _strip_command_prefix(self, text: str) -> str:
-        for prefix in COMMAND_PREFIXES:
-            if text.startswith(prefix):
-                return text[len(prefix) :].strip()
-        return text
+        m = _PREFIX_RE.match(text)
+        return text[m.end() :].strip() if m else text
+
+    def _identify(self, event: AstrMessageEvent) -> tuple[str, str, str]:
+        return str(event.get_sender_id()), event.get_sender_name(), event.unified_msg_origin
 
     def _platform_id_from_umo(self, umo: str) -> str:
         if not umo:
@@ -2615,9 +3155,10 @@ class LiarsBarBasicPlugin(Star):
 
     def _is_duplicate_event(self, event: AstrMessageEvent) -> bool:
         now = time.time()
-        for key, exp in list(self.recent_event_cache.items()):
-            if exp < now:
-                self.recent_event_cache.pop(key, None)
+        # Every entry has the same TTL, so insertion order is expiry order: trim from the front only.
+        cache = self.recent_event_cache
+        while cache and (len(cache) > RECENT_EVENT_CACHE_MAX or next(iter(cache.values())) < now):
+            cache.popitem(last=False)
 
         message_id = None
         message_obj = getattr(event, "message_obj", None)
@@ -2630,7 +3171,7 @@ class LiarsBarBasicPlugin(Star):
         key = f"{event.unified_msg_origin}:{message_id}"
         if key in self.recent_event_cache:
             return True
-        self.recent_event_cache[key] = now + 30
+        self.recent_event_cache[key] = now + RECENT_EVENT_TTL_SECONDS
         return False
 
     def _guide(self, body: str, next_step: str) -> str:
@@ -2644,6 +3185,11 @@ class LiarsBarBasicPlugin(Star):
         return body
 
     def _help_text(self) -> str:
+        if self._help_text_cache is None:
+            self._help_text_cache = self._render_help_text()
+        return self._help_text_cache
+
+    def _render_help_text(self) -> str:
         return (
             "【骗子酒馆基础版 帮助】\n"
             "发牌：每小局会清空上局手牌，并给当前存活玩家每人固定发 5 张；牌型=太阳/月亮/星星/魔术。\n"
@@ -2709,68 +3255,70 @@ class LiarsBarBasicPlugin(Star):
 
         self.rooms = loaded_rooms
         self.player_room_index = {}
+        self.room_player_index = {}
         # rebuild index from room state to avoid stale mapping
         for room in self.rooms.values():
-            for uid in room.order:
-                player = room.players.get(uid)
-                if player and not player.is_ai:
-                    self.player_room_index[str(uid)] = room.room_id
+            for player in room.order_players:
+                if not player.is_ai:
+                    self._index_player_locked(player.user_id, room.room_id)
 
     def _normalize_room_state(self, room: RoomState) -> None:
         # Keep order/player structures consistent even if persisted state is edited or partially corrupted.
+        # One pass: dedupe order, drop unknown ids and normalize AI labels together.
         seen: set[str] = set()
         cleaned_order: list[str] = []
-        for uid in room.order:
-            suid = str(uid)
-            if suid in room.players and suid not in seen:
-                cleaned_order.append(suid)
-                seen.add(suid)
-        if not cleaned_order:
-            cleaned_order = [str(uid) for uid in room.players.keys()]
-        room.order = cleaned_order
-
         used_ai_names: set[str] = set()
         max_ai_seq = max(0, int(room.ai_seq))
-        for uid in room.order:
-            player = room.players.get(uid)
-            if not player:
-                continue
-            player.user_id = uid
-            if player.is_ai:
-                label = player.ai_label or player.name
-                match = re.search(r"AI-(\d+)", label)
-                if match:
-                    max_ai_seq = max(max_ai_seq, int(match.group(1)))
-                if not label.startswith("AI-"):
-                    max_ai_seq += 1
-                    label = f"AI-{max_ai_seq}"
-                if label in used_ai_names:
-                    max_ai_seq += 1
-                    label = f"AI-{max_ai_seq}"
-                used_ai_names.add(label)
-                player.ai_label = label
-                player.name = label
-                player.dm_reachable = True
-            else:
-                player.ai_label = ""
+        # Walk order first; only when none of its ids are known fall back to the players dict.
+        # An empty pass touches no player, so the fallback starts from clean state.
+        for source in (room.order, room.players):
+            if cleaned_order:
+                break
+            for uid in source:
+                suid = str(uid)
+                if suid in seen or (player := room.players.get(suid)) is None:
+                    continue
+                seen.add(suid)
+                cleaned_order.append(suid)
+                player.user_id = suid
+                if player.is_ai:
+                    label = player.ai_label or player.name
+                    match = _AI_SEQ_RE.search(label) if "AI-" in label else None
+                    if match:
+                        max_ai_seq = max(max_ai_seq, int(match.group(1)))
+                    if not label.startswith("AI-"):
+                        max_ai_seq += 1
+                        label = f"AI-{max_ai_seq}"
+                    if label in used_ai_names:
+                        max_ai_seq += 1
+                        label = f"AI-{max_ai_seq}"
+                    used_ai_names.add(label)
+                    player.ai_label = label
+                    player.name = label
+                    player.dm_reachable = True
+                else:
+                    player.ai_label = ""
+                    player.private_umo = self._private_umo(room.platform_id, suid)
+        room.set_order(cleaned_order)
         room.ai_seq = max_ai_seq
 
-        if room.owner_id not in room.players and room.order:
+        owner = room.players.get(room.owner_id)
+        if not owner and room.order:
             room.owner_id = room.order[0]
-            room.owner_name = room.players[room.owner_id].name
-        if room.owner_id in room.players and room.players[room.owner_id].is_ai:
-            human_owner = next((uid for uid in room.order if uid in room.players and not room.players[uid].is_ai), "")
+            owner = room.players[room.owner_id]
+            room.owner_name = owner.name
+        if owner and owner.is_ai:
+            human_owner = next((p for p in room.order_players if not p.is_ai), None)
             if human_owner:
-                room.owner_id = human_owner
-                room.owner_name = room.players[human_owner].name
+                room.owner_id = human_owner.user_id
+                room.owner_name = human_owner.name
 
         if room.current_turn_user_id and room.current_turn_user_id not in room.players:
             room.current_turn_user_id = room.order[0] if room.order else ""
 
         if room.pending_wire_user_id and room.pending_wire_user_id not in room.players:
             room.pending_wire_user_id = ""
-            room.wire_options = []
-            room.wire_index_map = {}
+            room.set_wire_options(())
             room.wire_deadline_ts = 0
 
         if room.last_play and room.last_play.player_id not in room.players:
@@ -2788,12 +3336,67 @@ class LiarsBarBasicPlugin(Star):
             room.round_deck_counts = self._build_locked_deck_counts(base_players)
             room.round_deck_total = sum(room.round_deck_counts.values())
 
-    async def _save_state_locked(self) -> None:
+    def _serialize_state_locked(self) -> bytes:
         payload = {
             "rooms": {rid: room.to_dict() for rid, room in self.rooms.items()},
             "player_room_index": self.player_room_index,
         }
+        return self.state_repo.serialize(payload)
+
+    def _save_state_locked(self) -> None:
+        # Write-behind: mark dirty and let one debounced flush serialize whatever changed in the window.
+        self._save_dirty = True
+        if self._save_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_dirty = False
+            self._enqueue_state_snapshot()
+            return
+        self._save_handle = loop.call_later(SAVE_DEBOUNCE_SECONDS, self._on_save_due)
+
+    def _on_save_due(self) -> None:
+        self._save_handle = None
+        self._spawn_timer_handler(self._flush_state(), "酒馆保存状态失败")
+
+    async def _flush_state(self) -> None:
+        async with self.state_lock:
+            if not self._save_dirty:
+                return
+            self._save_dirty = False
+            self._enqueue_state_snapshot()
+
+    def _enqueue_state_snapshot(self) -> None:
+        # Serialize under the lock; the disk write happens in _saver_loop after the lock is released.
+        try:
+            data = self._serialize_state_locked()
+            self._save_seq += 1
+            self.save_queue.put_nowait((self._save_seq, data))
+        except Exception as exc:
+            logger.error(f"酒馆保存状态失败: {exc}")
+
+    async def _saver_loop(self) -> None:
+        while True:
+            item = await self.save_queue.get()
+            # Only the newest state matters; drop blobs superseded while the last write was running.
+            while not self.save_queue.empty():
+                item = self.save_queue.get_nowait()
+            await self._persist_bytes(*item)
+
+    async def _persist_bytes(self, seq: int, data: bytes) -> None:
+        try:
+            await asyncio.to_thread(self.state_repo.save_bytes, data, seq)
+        except Exception as exc:
+            logger.error(f"酒馆保存状态失败: {exc}")
+
+    def _flush_pending_save(self) -> None:
+        item: Optional[tuple[int, bytes]] = None
+        while not self.save_queue.empty():
+            item = self.save_queue.get_nowait()
+        if item is None:
+            return
         try:
-            self.state_repo.save(payload)
+            self.state_repo.save_bytes(item[1], item[0])
         except Exception as exc:
             logger.error(f"酒馆保存状态失败: {exc}")